@@ -0,0 +1,83 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    """Cheap checks run before a submit request reaches the ParkingSystem.
+
+    In order: a per-client token bucket (429), a fast-fail when no open slot
+    is free anywhere (503), and a cap on concurrent submits (503). Rejected
+    calls never validate, hash or allocate.
+    """
+
+    def __init__(
+        self,
+        free_capacity: Callable[[], int],
+        rate_per_second: float = 5.0,
+        burst: int = 10,
+        max_in_flight: int = 32,
+        full_retry_after: float = 30.0,
+        max_clients: int = 10000,
+    ) -> None:
+        if rate_per_second <= 0 or burst <= 0 or max_in_flight <= 0:
+            raise ValueError("rate_per_second, burst and max_in_flight must be positive")
+
+        self._free_capacity = free_capacity
+        self._rate = rate_per_second
+        self._burst = float(burst)
+        self._full_retry_after = full_retry_after
+        self._max_clients = max_clients
+
+        # client_id -> [tokens, last_refill]; least recently seen first
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._buckets_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    @contextmanager
+    def admit(self, client_id: str) -> Iterator[None]:
+        self._take_token(client_id)
+
+        if self._free_capacity() <= 0:
+            raise AdmissionRejected(503, "No parking slots available", self._full_retry_after)
+
+        if not self._in_flight.acquire(blocking=False):
+            raise AdmissionRejected(503, "Too many requests in progress", 1.0)
+        try:
+            yield
+        finally:
+            self._in_flight.release()
+
+    def _take_token(self, client_id: str) -> None:
+        now = time.monotonic()
+        with self._buckets_lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = [self._burst, now]
+                self._buckets[client_id] = bucket
+                if len(self._buckets) > self._max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+                bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+                bucket[1] = now
+
+            if bucket[0] < 1.0:
+                raise AdmissionRejected(
+                    429, "Rate limit exceeded", (1.0 - bucket[0]) / self._rate
+                )
+            bucket[0] -= 1.0
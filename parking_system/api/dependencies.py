@@ -0,0 +1,115 @@
+import threading
+from typing import Optional
+
+from flask import current_app, request
+
+from engines.shared_occupancy import SharedOccupancyError, SharedOccupancyTable
+from orchestrator.micro_batcher import MicroBatcher
+from orchestrator.parking_system import ParkingSystem
+from .admission import AdmissionController
+from .http_cache import VersionedResponseCache
+
+
+SYSTEM_EXTENSION = "parking_system"
+SYSTEM_FACTORY_EXTENSION = "parking_system_factory"
+ADMISSION_EXTENSION = "admission_controller"
+RESPONSE_CACHE_EXTENSION = "response_cache"
+BATCHER_EXTENSION = "micro_batcher"
+OCCUPANCY_EXTENSION = "occupancy_table"
+
+_build_lock = threading.Lock()
+
+
+def get_parking_system() -> ParkingSystem:
+    """Return the app's ParkingSystem, building it on first use if it was not preloaded."""
+    system = current_app.extensions.get(SYSTEM_EXTENSION)
+    if system is None:
+        with _build_lock:
+            system = current_app.extensions.get(SYSTEM_EXTENSION)
+            if system is None:
+                factory = current_app.extensions[SYSTEM_FACTORY_EXTENSION]
+                system = factory(current_app.config)
+                current_app.extensions[SYSTEM_EXTENSION] = system
+    return system
+
+
+def get_admission_controller() -> AdmissionController:
+    controller = current_app.extensions.get(ADMISSION_EXTENSION)
+    if controller is None:
+        system = get_parking_system()
+        with _build_lock:
+            controller = current_app.extensions.get(ADMISSION_EXTENSION)
+            if controller is None:
+                config = current_app.config
+                controller = AdmissionController(
+                    system.free_capacity,
+                    rate_per_second=config["ADMISSION_RATE_PER_SECOND"],
+                    burst=config["ADMISSION_BURST"],
+                    max_in_flight=config["ADMISSION_MAX_IN_FLIGHT"],
+                    full_retry_after=config["ADMISSION_FULL_RETRY_AFTER"],
+                )
+                current_app.extensions[ADMISSION_EXTENSION] = controller
+    return controller
+
+
+def get_response_cache() -> VersionedResponseCache:
+    cache = current_app.extensions.get(RESPONSE_CACHE_EXTENSION)
+    if cache is None:
+        with _build_lock:
+            cache = current_app.extensions.get(RESPONSE_CACHE_EXTENSION)
+            if cache is None:
+                cache = VersionedResponseCache(current_app.config["RESPONSE_CACHE_SIZE"])
+                current_app.extensions[RESPONSE_CACHE_EXTENSION] = cache
+    return cache
+
+
+def get_micro_batcher() -> Optional[MicroBatcher]:
+    """Return the app's MicroBatcher, or None when BATCH_WINDOW_MS is 0."""
+    window_ms = current_app.config["BATCH_WINDOW_MS"]
+    if not window_ms:
+        return None
+    batcher = current_app.extensions.get(BATCHER_EXTENSION)
+    if batcher is None:
+        system = get_parking_system()
+        with _build_lock:
+            batcher = current_app.extensions.get(BATCHER_EXTENSION)
+            if batcher is None:
+                batcher = MicroBatcher(
+                    system,
+                    window_seconds=window_ms / 1000,
+                    max_batch=current_app.config["BATCH_MAX_SIZE"],
+                )
+                current_app.extensions[BATCHER_EXTENSION] = batcher
+    return batcher
+
+
+def get_occupancy_table() -> Optional[SharedOccupancyTable]:
+    """Return the attached shared occupancy table on a SHARED_OCCUPANCY reader, else None.
+
+    Reattaches when the writer has replaced the segment; raises
+    SharedOccupancyError while no writer has created it.
+    """
+    if current_app.config["SHARED_OCCUPANCY"] != "reader":
+        return None
+    table = current_app.extensions.get(OCCUPANCY_EXTENSION)
+    if table is None or table.is_retired:
+        with _build_lock:
+            table = current_app.extensions.get(OCCUPANCY_EXTENSION)
+            if table is None or table.is_retired:
+                name = current_app.config["SHARED_OCCUPANCY_NAME"]
+                try:
+                    fresh = SharedOccupancyTable.attach(name)
+                except FileNotFoundError as e:
+                    raise SharedOccupancyError(f"Occupancy table '{name}' has not been created by a writer") from e
+                # Requests in flight may still read the retired table; it is closed when collected.
+                table = fresh
+                current_app.extensions[OCCUPANCY_EXTENSION] = table
+    return table
+
+
+def client_id() -> str:
+    """Key used for per-client rate limiting; the remote address unless a proxy header is configured."""
+    header = current_app.config["ADMISSION_CLIENT_HEADER"]
+    if header and request.headers.get(header):
+        return request.headers[header]
+    return request.remote_addr or "unknown"
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, current_app, json, request
+
+
+class VersionedResponseCache:
+    """LRU cache of rendered JSON bodies, each valid for one version of its source."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, version: int, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def versioned_json_response(
+    cache: VersionedResponseCache,
+    key: str,
+    version: int,
+    render: Callable[[], Dict[str, Any]],
+) -> Response:
+    """Answer a GET from ``version`` alone when possible.
+
+    A matching If-None-Match gets a bodyless 304, and a cached body for the
+    same version is reused. ``render`` only runs on a cache miss.
+    """
+    etag = f"{key}-{version}"
+
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    body = cache.get(key, version)
+    if body is None:
+        body = json.dumps(render()).encode("utf-8")
+        cache.put(key, version, body)
+
+    response = current_app.response_class(body, status=200, mimetype="application/json")
+    response.set_etag(etag)
+    return response
@@ -1,10 +1,10 @@
-from flask import Blueprint, request, jsonify, render_template
-from pydantic import ValidationError
-from ..schemas.request import RollbackSchema
-from ..schemas.response import GenericResponse
+from flask import Blueprint, Response, request, jsonify, render_template
 
-# Will be injected by app.py
-parking_system_instance = None
+from ..dependencies import get_occupancy_table, get_parking_system, get_response_cache
+from ..http_cache import versioned_json_response
+from engines.shared_occupancy import SharedOccupancyError
+from orchestrator.parking_system import ParkingSystemError
+from domain.parking_request import ParkingRequestState
 
 # Routes for rendering pages
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
@@ -15,7 +15,7 @@ admin_api_bp = Blueprint("admin_api", __name__, url_prefix="/api/admin")
 
 @admin_bp.route("/dashboard")
 def dashboard():
-    zones = parking_system_instance.zones
+    zones = get_parking_system().zones
     return render_template("admin/dashboard.html", zones=zones.values())
 
 
@@ -33,6 +33,10 @@ def system():
 
 @admin_api_bp.route("/rollback", methods=["POST"])
 def rollback():
+    from pydantic import ValidationError
+    from ..schemas.request import RollbackSchema
+    from ..schemas.response import GenericResponse
+
     try:
         if not request.is_json:
             return jsonify({"status": "error", "message": "Content-Type must be application/json"}), 400
@@ -42,7 +46,7 @@ def rollback():
         if data.k <= 0:
             return jsonify({"status": "error", "message": "k must be a positive integer"}), 400
         
-        parking_system_instance.rollback_last_k_operations(data.k)
+        get_parking_system().rollback_last_k_operations(data.k)
         resp = GenericResponse(status="success", message=f"Rolled back last {data.k} operations", data=None)
         return jsonify(resp.dict()), 200
     except ValidationError as e:
@@ -51,31 +55,67 @@ def rollback():
         return jsonify({"status": "error", "message": str(e)}), 409
 
 
+@admin_api_bp.route("/maintenance", methods=["POST"])
+def maintenance():
+    from pydantic import ValidationError
+    from ..schemas.request import MaintenanceSchema
+    from ..schemas.response import GenericResponse
+
+    try:
+        if not request.is_json:
+            return jsonify({"status": "error", "message": "Content-Type must be application/json"}), 400
+
+        data = MaintenanceSchema(**request.json)
+
+        system = get_parking_system()
+        actions = {
+            "close": system.close_area,
+            "drain": system.drain_area,
+            "reopen": system.reopen_area,
+        }
+        summary = actions[data.action](data.zone_id, data.area_id)
+        resp = GenericResponse(status="success", message=summary, data=None)
+        return jsonify(resp.dict()), 200
+    except ValidationError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
+
+
 @admin_api_bp.route("/zones", methods=["GET"])
 def zones():
+    from ..schemas.response import GenericResponse
+
     try:
-        zones_data = []
-        for zone_id, zone in parking_system_instance.zones.items():
-            total_slots = sum(len(area.slots) for area in zone.areas)
-            occupied_slots = sum(len([s for s in area.slots if s.is_occupied]) for area in zone.areas)
-            zones_data.append({
-                "zone_id": zone_id,
-                "zone_name": zone.zone_name,
-                "total_slots": total_slots,
-                "occupied_slots": occupied_slots,
-                "available_slots": total_slots - occupied_slots
-            })
-        resp = GenericResponse(status="success", message="Zones fetched", data=zones_data)
-        return jsonify(resp.dict()), 200
+        table = get_occupancy_table()
+        if table is not None:
+            zone_snapshots = table.read_zones()
+            cache_key = f"zones-{table.generation}"
+        else:
+            system = get_parking_system()
+            zone_snapshots = system.get_snapshot().zones
+            cache_key = f"zones-{system.epoch}"
+        version = sum(zone.version for zone in zone_snapshots)
+
+        def render():
+            zones_data = [zone.to_dict() for zone in zone_snapshots]
+            resp = GenericResponse(status="success", message="Zones fetched", data=zones_data)
+            return resp.dict()
+
+        return versioned_json_response(get_response_cache(), cache_key, version, render)
+    except SharedOccupancyError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
         return jsonify({"status": "error", "message": f"Failed to fetch zones: {str(e)}"}), 500
 
 
 @admin_api_bp.route("/metrics", methods=["GET"])
 def metrics():
+    from ..schemas.response import GenericResponse
+
     try:
-        metrics_data = parking_system_instance.get_metrics()
-        resp = GenericResponse(status="success", message="Metrics fetched", data=metrics_data)
+        metrics_snapshot = get_parking_system().get_metrics_snapshot()
+        resp = GenericResponse(status="success", message="Metrics fetched", data=dict(metrics_snapshot.values))
         return jsonify(resp.dict()), 200
     except Exception as e:
         return jsonify({"status": "error", "message": f"Failed to fetch metrics: {str(e)}"}), 500
@@ -83,26 +123,100 @@ def metrics():
 
 @admin_api_bp.route("/recent_operations", methods=["GET"])
 def recent_operations():
+    from ..schemas.response import GenericResponse
+
     try:
-        # Get the rollback history from operations_registry
-        ops_list = []
-        
-        # Try to get operations from the parking system's operations registry
-        if hasattr(parking_system_instance, 'operations_registry'):
-            ops_list = list(parking_system_instance.operations_registry.values())[-10:]
-        
-        # Format operations
-        formatted_ops = []
-        for op in ops_list:
-            formatted_ops.append({
-                "id": str(getattr(op, 'id', 'unknown')),
-                "type": getattr(op, 'type', 'unknown'),
-                "description": getattr(op, 'description', 'Operation'),
-                "timestamp": getattr(op, 'timestamp', '')
-            })
-        
+        snapshot = get_parking_system().get_snapshot()
+        formatted_ops = [op.to_dict() for op in snapshot.recent_operations]
         resp = GenericResponse(status="success", message="Recent operations fetched", data=formatted_ops)
         return jsonify(resp.dict()), 200
     except Exception as e:
         return jsonify({"status": "error", "message": f"Failed to fetch operations: {str(e)}"}), 500
 
+
+@admin_api_bp.route("/requests", methods=["GET"])
+def list_requests():
+    from pydantic import ValidationError
+    from ..schemas.request import RequestListSchema
+    from ..schemas.response import GenericResponse, request_to_dict
+
+    try:
+        data = RequestListSchema(**request.args.to_dict())
+
+        state = None
+        if data.state:
+            try:
+                state = ParkingRequestState(data.state.upper())
+            except ValueError:
+                return jsonify({"status": "error", "message": f"Unknown state '{data.state}'"}), 400
+
+        page, next_cursor = get_parking_system().list_requests(
+            state=state,
+            zone_id=data.zone_id,
+            vehicle_id=data.vehicle_id,
+            created_after=data.created_after,
+            created_before=data.created_before,
+            cursor=data.cursor,
+            limit=data.limit,
+        )
+        resp = GenericResponse(
+            status="success",
+            message="Requests fetched",
+            data={
+                "requests": [request_to_dict(req) for req in page],
+                "next_cursor": next_cursor,
+            },
+        )
+        return jsonify(resp.dict()), 200
+    except ValidationError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except ParkingSystemError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"Failed to fetch requests: {str(e)}"}), 500
+
+
+@admin_api_bp.route("/export/<kind>", methods=["GET"])
+def export(kind):
+    from pydantic import ValidationError
+    from ..schemas.request import ExportSchema
+    from engines.exporter import MIMETYPES
+
+    try:
+        data = ExportSchema(**request.args.to_dict())
+        system = get_parking_system()
+
+        if kind == "requests":
+            state = None
+            if data.state:
+                try:
+                    state = ParkingRequestState(data.state.upper())
+                except ValueError:
+                    return jsonify({"status": "error", "message": f"Unknown state '{data.state}'"}), 400
+            chunks = system.export_requests(
+                data.format, data.gzip, state, data.created_after, data.created_before
+            )
+        elif kind == "operations":
+            operation_type = data.operation_type.upper() if data.operation_type else None
+            chunks = system.export_operations(
+                data.format, data.gzip, operation_type, data.created_after, data.created_before
+            )
+        else:
+            return jsonify({"status": "error", "message": f"Unknown export '{kind}'"}), 404
+
+        filename = f"{kind}.{data.format}"
+        mimetype = MIMETYPES[data.format]
+        if data.gzip:
+            filename += ".gz"
+            mimetype = "application/gzip"
+        return Response(
+            chunks,
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    except ValidationError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except ParkingSystemError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"Export failed: {str(e)}"}), 500
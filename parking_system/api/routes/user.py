@@ -1,11 +1,18 @@
 from flask import Blueprint, request, jsonify, render_template
-from pydantic import ValidationError
-from ..schemas.request import SubmitRequestSchema, ReleaseRequestSchema
-from ..schemas.response import GenericResponse
-from orchestrator.parking_system import ParkingSystem, ParkingSystemError
 
-# Will be injected by app.py
-parking_system_instance = None
+from ..admission import AdmissionRejected
+from ..dependencies import (
+    client_id,
+    get_admission_controller,
+    get_micro_batcher,
+    get_occupancy_table,
+    get_parking_system,
+    get_response_cache,
+)
+from ..http_cache import versioned_json_response
+from engines.shared_occupancy import SharedOccupancyError
+from orchestrator.parking_system import ParkingSystemError
+from domain.parking_slot import SlotFeature
 
 user_bp = Blueprint("user", __name__, url_prefix="/api/user")
 
@@ -22,6 +29,19 @@ def status_page():
 
 @user_bp.route("/submit_request", methods=["POST"])
 def submit_request():
+    try:
+        with get_admission_controller().admit(client_id()):
+            return _submit_request()
+    except AdmissionRejected as e:
+        body = {"status": "error", "message": str(e)}
+        return jsonify(body), e.status_code, {"Retry-After": e.retry_after_header}
+
+
+def _submit_request():
+    from pydantic import ValidationError
+    from ..schemas.request import SubmitRequestSchema
+    from ..schemas.response import GenericResponse
+
     try:
         if not request.is_json:
             return jsonify({"status": "error", "message": "Content-Type must be application/json"}), 400
@@ -32,7 +52,14 @@ def submit_request():
         if not data.vehicle_id or not data.preferred_zone_id:
             return jsonify({"status": "error", "message": "vehicle_id and preferred_zone_id are required"}), 400
         
-        req_id = parking_system_instance.submit_request(data.vehicle_id, data.preferred_zone_id)
+        try:
+            required_features = SlotFeature.from_names(data.required_features)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        batcher = get_micro_batcher()
+        submit = batcher.submit if batcher is not None else get_parking_system().submit_request
+        req_id = submit(data.vehicle_id, data.preferred_zone_id, required_features)
         resp = GenericResponse(status="success", message="Request submitted", data={"request_id": req_id})
         return jsonify(resp.dict()), 200
     except ValidationError as e:
@@ -45,35 +72,73 @@ def submit_request():
 
 @user_bp.route("/status/<request_id>", methods=["GET"])
 def get_status(request_id):
+    from ..schemas.response import GenericResponse, request_to_dict
+
     try:
         if not request_id or not request_id.strip():
             return jsonify({"status": "error", "message": "request_id is required"}), 400
         
-        req = parking_system_instance.requests_registry.get(request_id)
+        table = get_occupancy_table()
+        if table is not None:
+            req = table.read_request(request_id)
+            cache_key = f"req-{table.generation}-{request_id}"
+        else:
+            system = get_parking_system()
+            req = system.requests_registry.get(request_id)
+            cache_key = f"req-{system.epoch}-{request_id}"
         if not req:
             return jsonify({"status": "error", "message": "Request not found"}), 404
         
-        resp = GenericResponse(
-            status="success",
-            message="Status retrieved",
-            data={
-                "request_id": req.request_id,
-                "vehicle_id": req.vehicle_id,
-                "state": req.state.value,
-                "allocated_zone_id": req.allocated_zone_id,
-                "allocated_area_id": req.allocated_area_id,
-                "allocated_slot_id": req.allocated_slot_id,
-                "created_at": req.created_at.isoformat(),
-                "updated_at": req.updated_at.isoformat(),
-            }
-        )
-        return jsonify(resp.dict()), 200
+        def render():
+            resp = GenericResponse(
+                status="success",
+                message="Status retrieved",
+                data=request_to_dict(req),
+            )
+            return resp.dict()
+
+        return versioned_json_response(get_response_cache(), cache_key, req.version, render)
+    except SharedOccupancyError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@user_bp.route("/availability", methods=["GET"])
+def availability():
+    from ..schemas.response import GenericResponse
+
+    try:
+        names = [
+            name.strip()
+            for value in request.args.getlist("required_features")
+            for name in value.split(",")
+            if name.strip()
+        ]
+        try:
+            required_features = SlotFeature.from_names(names)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        table = get_occupancy_table()
+        if table is not None:
+            free = table.availability(required_features)
+        else:
+            free = get_parking_system().availability(required_features)
+        resp = GenericResponse(status="success", message="Availability fetched", data=free)
+        return jsonify(resp.dict()), 200
+    except SharedOccupancyError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"Failed to fetch availability: {str(e)}"}), 500
+
+
 @user_bp.route("/release_request", methods=["POST"])
 def release_request():
+    from pydantic import ValidationError
+    from ..schemas.request import ReleaseRequestSchema
+    from ..schemas.response import GenericResponse
+
     try:
         if not request.is_json:
             return jsonify({"status": "error", "message": "Content-Type must be application/json"}), 400
@@ -83,7 +148,7 @@ def release_request():
         if not data.request_id:
             return jsonify({"status": "error", "message": "request_id is required"}), 400
         
-        parking_system_instance.release_request(data.request_id)
+        get_parking_system().release_request(data.request_id)
         resp = GenericResponse(status="success", message="Request released", data=None)
         return jsonify(resp.dict()), 200
     except ValidationError as e:
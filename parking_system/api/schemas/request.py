@@ -1,9 +1,13 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
 class SubmitRequestSchema(BaseModel):
     vehicle_id: str = Field(..., example="V123")
     preferred_zone_id: str = Field(..., example="Z1")
+    required_features: List[str] = Field(default_factory=list, example=["EV_CHARGING"])
 
 
 class ReleaseRequestSchema(BaseModel):
@@ -12,3 +16,28 @@ class ReleaseRequestSchema(BaseModel):
 
 class RollbackSchema(BaseModel):
     k: int = Field(..., ge=1, example=1)
+
+
+class MaintenanceSchema(BaseModel):
+    action: Literal["close", "drain", "reopen"] = Field(..., example="drain")
+    zone_id: str = Field(..., example="Z1")
+    area_id: Optional[str] = Field(None, example="A1")
+
+
+class RequestListSchema(BaseModel):
+    state: Optional[str] = Field(None, example="ACTIVE")
+    zone_id: Optional[str] = Field(None, example="Z1")
+    vehicle_id: Optional[str] = Field(None, example="V123")
+    created_after: Optional[datetime] = Field(None, example="2024-01-15T08:00:00+00:00")
+    created_before: Optional[datetime] = Field(None, example="2024-01-15T18:00:00+00:00")
+    cursor: Optional[str] = Field(None, example="2a")
+    limit: int = Field(50, ge=1, le=500, example=50)
+
+
+class ExportSchema(BaseModel):
+    format: Literal["ndjson", "csv"] = Field("ndjson", example="csv")
+    gzip: bool = Field(False, example=True)
+    state: Optional[str] = Field(None, example="COMPLETED")
+    operation_type: Optional[str] = Field(None, example="ALLOCATE")
+    created_after: Optional[datetime] = Field(None, example="2024-01-15T00:00:00+00:00")
+    created_before: Optional[datetime] = Field(None, example="2024-01-16T00:00:00+00:00")
@@ -1,7 +1,24 @@
+from typing import Any, Dict
+
 from pydantic import BaseModel
 
 
 class GenericResponse(BaseModel):
     status: str
     message: str
-    data: dict | None = None
+    data: dict | list | None = None
+
+
+def request_to_dict(req) -> Dict[str, Any]:
+    return {
+        "request_id": req.request_id,
+        "vehicle_id": req.vehicle_id,
+        "preferred_zone_id": req.preferred_zone_id,
+        "required_features": req.required_features.to_names(),
+        "state": req.state.value,
+        "allocated_zone_id": req.allocated_zone_id,
+        "allocated_area_id": req.allocated_area_id,
+        "allocated_slot_id": req.allocated_slot_id,
+        "created_at": req.created_at.isoformat(),
+        "updated_at": req.updated_at.isoformat(),
+    }
@@ -1,60 +1,160 @@
-from flask import Flask, send_from_directory, render_template
-import sys
+import atexit
 import os
+from typing import Any, Callable, Dict, Optional
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask, jsonify, render_template, request
 
+from api.dependencies import SYSTEM_EXTENSION, SYSTEM_FACTORY_EXTENSION
+from engines.shared_occupancy import SharedOccupancyTable
 from orchestrator.parking_system import ParkingSystem
 from domain.zone import Zone
 from domain.parking_area import ParkingArea
 from domain.parking_slot import ParkingSlot
-from api.routes.user import user_bp
-from api.routes.admin import admin_bp, admin_api_bp
+
 
 # ----- Sample Zones Setup -----
-# Zone Z1 with 2 areas, each with 3 slots
-slots_a1 = [ParkingSlot(f"S{i}", "A1") for i in range(1, 4)]
-slots_a2 = [ParkingSlot(f"S{i}", "A2") for i in range(4, 7)]
-area1 = ParkingArea("A1", "Z1", slots_a1)
-area2 = ParkingArea("A2", "Z1", slots_a2)
-zone1 = Zone("Z1", "Downtown", [area1, area2])
-
-# Zone Z2 with 1 area, 2 slots
-slots_b1 = [ParkingSlot(f"S{i}", "B1") for i in range(1, 3)]
-area3 = ParkingArea("B1", "Z2", slots_b1)
-zone2 = Zone("Z2", "Airport", [area3])
-
-zones = {
-    "Z1": zone1,
-    "Z2": zone2
+def build_sample_zones() -> Dict[str, Zone]:
+    # Zone Z1 with 2 areas, each with 3 slots
+    slots_a1 = [ParkingSlot(f"S{i}", "A1") for i in range(1, 4)]
+    slots_a2 = [ParkingSlot(f"S{i}", "A2") for i in range(4, 7)]
+    area1 = ParkingArea("A1", "Z1", slots_a1)
+    area2 = ParkingArea("A2", "Z1", slots_a2)
+    zone1 = Zone("Z1", "Downtown", [area1, area2])
+
+    # Zone Z2 with 1 area, 2 slots
+    slots_b1 = [ParkingSlot(f"S{i}", "B1") for i in range(1, 3)]
+    area3 = ParkingArea("B1", "Z2", slots_b1)
+    zone2 = Zone("Z2", "Airport", [area3])
+
+    return {
+        "Z1": zone1,
+        "Z2": zone2
+    }
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    # Callable returning the zone topology for a freshly built ParkingSystem
+    "ZONES_FACTORY": build_sample_zones,
+    "SNAPSHOT_MAX_STALENESS": 1.0,
+    # Build the ParkingSystem and import request handling modules inside
+    # create_app, e.g. in a prefork master, so workers share them copy-on-write.
+    "PRELOAD": False,
+    # Admission control on /api/user/submit_request
+    "ADMISSION_RATE_PER_SECOND": 5.0,
+    "ADMISSION_BURST": 10,
+    "ADMISSION_MAX_IN_FLIGHT": 32,
+    "ADMISSION_FULL_RETRY_AFTER": 30.0,
+    # Clients are rate-limited per remote address. Name a header here only if a
+    # trusted proxy sets it and strips any client-sent copy; clients can forge it.
+    "ADMISSION_CLIENT_HEADER": None,
+    # Rendered bodies kept for conditional GET on status and zone endpoints
+    "RESPONSE_CACHE_SIZE": 4096,
+    # Collect submits for this many milliseconds and allocate them together;
+    # 0 allocates each submit on arrival.
+    "BATCH_WINDOW_MS": 0,
+    "BATCH_MAX_SIZE": 1000,
+    # Shared-memory occupancy table for multi-process deployments: "writer"
+    # publishes this process's ParkingSystem, "reader" serves reads from it and
+    # rejects writes, None keeps everything in process.
+    "SHARED_OCCUPANCY": None,
+    "SHARED_OCCUPANCY_NAME": "parking-occupancy",
+    "SHARED_OCCUPANCY_REQUESTS": 65536,
 }
 
+# Endpoints a SHARED_OCCUPANCY reader can serve without a ParkingSystem
+READER_ENDPOINTS = {
+    "static",
+    "index",
+    "status",
+    "user.submit_request_page",
+    "user.status_page",
+    "user.get_status",
+    "user.availability",
+    "admin.analytics",
+    "admin.system",
+    "admin_api.zones",
+}
+
+
+def build_parking_system(config: Dict[str, Any]) -> ParkingSystem:
+    zones_factory: Callable[[], Dict[str, Zone]] = config["ZONES_FACTORY"]
+    zones = zones_factory()
+    occupancy_table = None
+    if config["SHARED_OCCUPANCY"] == "writer":
+        occupancy_table = SharedOccupancyTable.create(
+            config["SHARED_OCCUPANCY_NAME"], zones, config["SHARED_OCCUPANCY_REQUESTS"]
+        )
+        creator_pid = os.getpid()
+
+        def retire_on_exit() -> None:
+            # Forked workers inherit atexit handlers; only the creating process unlinks.
+            if os.getpid() == creator_pid:
+                occupancy_table.retire()
+
+        atexit.register(retire_on_exit)
+    return ParkingSystem(
+        zones,
+        snapshot_max_staleness=config["SNAPSHOT_MAX_STALENESS"],
+        occupancy_table=occupancy_table,
+    )
+
+
+def preload_modules() -> None:
+    # Modules the routes otherwise import on first request
+    import pydantic  # noqa: F401
+    import api.schemas.request  # noqa: F401
+    import api.schemas.response  # noqa: F401
+
+
 # ----- Flask App -----
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'), 
-            static_url_path='/static',
-            template_folder=os.path.join(os.path.dirname(__file__), 'templates'))
+def create_app(
+    config: Optional[Dict[str, Any]] = None,
+    parking_system: Optional[ParkingSystem] = None,
+) -> Flask:
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'),
+                static_url_path='/static',
+                template_folder=os.path.join(os.path.dirname(__file__), 'templates'))
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    if app.config["SHARED_OCCUPANCY"] not in (None, "writer", "reader"):
+        raise ValueError("SHARED_OCCUPANCY must be None, 'writer' or 'reader'")
+    is_reader = app.config["SHARED_OCCUPANCY"] == "reader"
+
+    if parking_system is None and app.config["PRELOAD"] and not is_reader:
+        parking_system = build_parking_system(app.config)
+    app.extensions[SYSTEM_FACTORY_EXTENSION] = build_parking_system
+    if parking_system is not None:
+        app.extensions[SYSTEM_EXTENSION] = parking_system
+    if app.config["PRELOAD"]:
+        preload_modules()
+
+    from api.routes.user import user_bp
+    from api.routes.admin import admin_bp, admin_api_bp
+
+    app.register_blueprint(user_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(admin_api_bp)
 
-# ----- Initialize ParkingSystem -----
-parking_system_instance = ParkingSystem(zones)
+    if is_reader:
+        @app.before_request
+        def reject_writes():
+            if request.endpoint not in READER_ENDPOINTS:
+                message = "This worker only serves reads from the shared occupancy table"
+                return jsonify({"status": "error", "message": message}), 503
 
-# Inject parking_system_instance into route modules
-import api.routes.user as user_module
-import api.routes.admin as admin_module
-user_module.parking_system_instance = parking_system_instance
-admin_module.parking_system_instance = parking_system_instance
+    @app.route("/")
+    def index():
+        return render_template("index.html")
 
-app.register_blueprint(user_bp)
-app.register_blueprint(admin_bp)
-app.register_blueprint(admin_api_bp)
+    @app.route("/api/status", methods=["GET"])
+    def status():
+        return {"status": "ok", "message": "Parking system is running"}
 
-@app.route("/")
-def index():
-    return render_template("index.html")
+    return app
 
-@app.route("/api/status", methods=["GET"])
-def status():
-    return {"status": "ok", "message": "Parking system is running"}
 
 # ----- Run -----
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    create_app({"PRELOAD": True}).run(debug=True, port=5000)
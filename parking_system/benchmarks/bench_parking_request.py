@@ -0,0 +1,82 @@
+"""Memory footprint and state-transition throughput of ParkingRequest.
+
+Run from the parking_system directory:
+
+    python benchmarks/bench_parking_request.py --requests 200000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.parking_request import ParkingRequest, ParkingRequestState
+from engines.request_index import RequestIndex
+
+
+LIFECYCLE = (
+    ParkingRequestState.VALIDATED,
+    ParkingRequestState.ALLOCATING,
+    ParkingRequestState.ALLOCATED,
+    ParkingRequestState.ACTIVE,
+    ParkingRequestState.COMPLETED,
+)
+
+
+def bench_memory(n: int, indexed: bool = False) -> float:
+    """Average bytes retained per live request, including its timestamps.
+
+    With ``indexed``, every request is also added to a RequestIndex, as
+    ParkingSystem does on submit, and the index's own lists and dicts are
+    counted too.
+    """
+    ids = [f"R{i}" for i in range(n)]  # allocated up front so they are not counted
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = RequestIndex() if indexed else None
+    requests = [ParkingRequest(request_id, "V1", "Z1") for request_id in ids]
+    for r in requests:
+        if index is not None:
+            index.add(r)
+        r.transition_to(ParkingRequestState.VALIDATED)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # subtract the list holding the requests
+    return (after - before - sys.getsizeof(requests)) / n
+
+
+def bench_transitions(n: int) -> float:
+    """Transitions per second over full NEW -> COMPLETED lifecycles."""
+    requests = [ParkingRequest(f"R{i}", "V1", "Z1") for i in range(n)]
+    started = time.perf_counter()
+    for r in requests:
+        for state in LIFECYCLE:
+            r.transition_to(state)
+    elapsed = time.perf_counter() - started
+    return n * len(LIFECYCLE) / elapsed
+
+
+def bench_construct(n: int) -> float:
+    """Requests constructed per second."""
+    ids = [f"R{i}" for i in range(n)]
+    started = time.perf_counter()
+    for request_id in ids:
+        ParkingRequest(request_id, "V1", "Z1")
+    return n / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"memory       {bench_memory(args.requests):10.1f} bytes/request")
+    print(f"indexed      {bench_memory(args.requests, indexed=True):10.1f} bytes/request")
+    print(f"construct    {bench_construct(args.requests):10,.0f} requests/s")
+    print(f"transitions  {bench_transitions(args.requests):10,.0f} transitions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Worker startup time and per-worker memory: cold boot vs. preloaded fork.
+
+Run from the parking_system directory:
+
+    python benchmarks/bench_worker_startup.py --workers 4 --zones 20 --areas 10 --slots 250
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.zone import Zone
+from domain.parking_area import ParkingArea
+from domain.parking_slot import ParkingSlot
+
+
+def build_zones(n_zones: int, n_areas: int, n_slots: int):
+    zones = {}
+    for z in range(n_zones):
+        zone_id = f"Z{z}"
+        areas = [
+            ParkingArea(f"{zone_id}A{a}", zone_id, [ParkingSlot(f"S{s}", f"{zone_id}A{a}") for s in range(n_slots)])
+            for a in range(n_areas)
+        ]
+        zones[zone_id] = Zone(zone_id, f"Zone {z}", areas)
+    return zones
+
+
+def memory_kb() -> dict:
+    """Resident and private (unshared) memory of the current process, in kB."""
+    stats = {"rss": 0, "private": 0}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "Rss":
+                    stats["rss"] = int(value.split()[0])
+                elif key in ("Private_Clean", "Private_Dirty"):
+                    stats["private"] += int(value.split()[0])
+    except OSError:
+        stats["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats["private"] = stats["rss"]
+    return stats
+
+
+def serve_first_request(app) -> None:
+    client = app.test_client()
+    resp = client.get("/api/admin/zones")
+    assert resp.status_code == 200, resp.data
+
+
+def worker_main(args) -> None:
+    # Cold worker: import, build and serve the first request from scratch.
+    started = time.perf_counter()
+    from app import create_app
+    app = create_app({"ZONES_FACTORY": lambda: build_zones(args.zones, args.areas, args.slots)})
+    serve_first_request(app)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"startup_s": elapsed, **memory_kb()}))
+
+
+def bench_cold(args) -> list:
+    results = []
+    for _ in range(args.workers):
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker",
+             "--zones", str(args.zones), "--areas", str(args.areas), "--slots", str(args.slots)],
+            check=True, capture_output=True, text=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def bench_preload(args) -> list:
+    from app import create_app
+
+    app = create_app({
+        "PRELOAD": True,
+        "ZONES_FACTORY": lambda: build_zones(args.zones, args.areas, args.slots),
+    })
+
+    results = []
+    for _ in range(args.workers):
+        read_fd, write_fd = os.pipe()
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            serve_first_request(app)
+            payload = {"startup_s": time.perf_counter() - started, **memory_kb()}
+            os.write(write_fd, json.dumps(payload).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+def report(label: str, results: list) -> None:
+    n = len(results)
+    startup_ms = sum(r["startup_s"] for r in results) / n * 1000
+    rss = sum(r["rss"] for r in results) / n / 1024
+    private = sum(r["private"] for r in results) / n / 1024
+    print(f"{label:<8} workers={n} startup={startup_ms:8.1f} ms  rss={rss:7.1f} MiB  private={private:7.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--areas", type=int, default=10)
+    parser.add_argument("--slots", type=int, default=250)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(args)
+        return
+
+    report("cold", bench_cold(args))
+    report("preload", bench_preload(args))
+
+
+if __name__ == "__main__":
+    main()
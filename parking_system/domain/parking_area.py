@@ -1,7 +1,19 @@
-from typing import Dict, List
-from .parking_slot import ParkingSlot, ParkingSlotError
+from typing import Dict, List, Optional
+from .parking_slot import ParkingSlot, ParkingSlotError, SlotFeature
 
 
+_FEATURE_COMBINATIONS = 1 << len([f for f in SlotFeature if f])
+
+# For each required feature mask, the slot feature masks that satisfy it,
+# fewest extra features first so scarce slots are kept for vehicles that need them.
+_MATCHING_COMBINATIONS: List[List[int]] = [
+    sorted(
+        (mask for mask in range(_FEATURE_COMBINATIONS) if mask & required == required),
+        key=lambda mask: (bin(mask).count("1"), mask),
+    )
+    for required in range(_FEATURE_COMBINATIONS)
+]
+
 
 class ParkingAreaError(Exception):
     pass
@@ -24,6 +36,19 @@ class ParkingArea:
         self._zone_id: str = zone_id
         self._slots: Dict[str, ParkingSlot] = {slot.slot_id: slot for slot in slots}
 
+        # Free-lists keyed by feature mask; dicts keep slot order and give O(1) removal.
+        self._free_slots: List[Dict[str, ParkingSlot]] = [
+            {} for _ in range(_FEATURE_COMBINATIONS)
+        ]
+        self._available_count: int = 0
+        self._is_closed: bool = False
+        # Bumped on every occupancy or open/closed change
+        self._version: int = 0
+        for slot in slots:
+            if slot.is_available:
+                self._free_slots[slot.features][slot.slot_id] = slot
+                self._available_count += 1
+
     # ---------- Properties ----------
     @property
     def area_id(self) -> str:
@@ -33,6 +58,14 @@ class ParkingArea:
     def zone_id(self) -> str:
         return self._zone_id
 
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
     @property
     def slots(self) -> List[ParkingSlot]:
         return list(self._slots.values())
@@ -48,11 +81,65 @@ class ParkingArea:
             raise ParkingAreaError(f"Slot ID '{slot_id}' does not exist in this area")
         return slot
 
+    def find_available_slot(
+        self, required: SlotFeature = SlotFeature.NONE
+    ) -> Optional[ParkingSlot]:
+        if self._is_closed:
+            return None
+        for mask in _MATCHING_COMBINATIONS[required]:
+            free = self._free_slots[mask]
+            if free:
+                return next(iter(free.values()))
+        return None
+
+    def find_free_slot_exact(self, features: SlotFeature) -> Optional[ParkingSlot]:
+        if self._is_closed:
+            return None
+        free = self._free_slots[features]
+        return next(iter(free.values())) if free else None
+
+    def free_counts_by_features(self) -> List[int]:
+        """Free slots per exact feature mask (index = mask); zeros when closed."""
+        if self._is_closed:
+            return [0] * _FEATURE_COMBINATIONS
+        return [len(free) for free in self._free_slots]
+
+    def available_count_for(self, required: SlotFeature = SlotFeature.NONE) -> int:
+        return sum(len(self._free_slots[mask]) for mask in _MATCHING_COMBINATIONS[required])
+
+    # ---------- Maintenance ----------
+    def close(self) -> None:
+        if not self._is_closed:
+            self._is_closed = True
+            self._version += 1
+
+    def reopen(self) -> None:
+        if self._is_closed:
+            self._is_closed = False
+            self._version += 1
+
+    # ---------- Occupancy ----------
+    def allocate_slot(self, slot_id: str, vehicle_id: str) -> ParkingSlot:
+        slot = self.get_slot(slot_id)
+        slot.allocate(vehicle_id)
+        del self._free_slots[slot.features][slot_id]
+        self._available_count -= 1
+        self._version += 1
+        return slot
+
+    def release_slot(self, slot_id: str) -> ParkingSlot:
+        slot = self.get_slot(slot_id)
+        slot.release()
+        self._free_slots[slot.features][slot_id] = slot
+        self._available_count += 1
+        self._version += 1
+        return slot
+
     def is_full(self) -> bool:
-        return len(self.available_slots) == 0
+        return self._available_count == 0
 
     def total_capacity(self) -> int:
         return len(self._slots)
 
     def available_count(self) -> int:
-        return len(self.available_slots)
+        return self._available_count
@@ -1,6 +1,9 @@
 from enum import Enum
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+import time
+
+from .parking_slot import SlotFeature
 
 
 class ParkingRequestError(Exception):
@@ -25,7 +28,10 @@ _ALLOWED_TRANSITIONS = {
         ParkingRequestState.ALLOCATING,
         ParkingRequestState.FAILED,
     },
-    ParkingRequestState.ALLOCATING: {ParkingRequestState.ALLOCATED},
+    ParkingRequestState.ALLOCATING: {
+        ParkingRequestState.ALLOCATED,
+        ParkingRequestState.FAILED,
+    },
     ParkingRequestState.ALLOCATED: {
         ParkingRequestState.ACTIVE,
         ParkingRequestState.CANCELLED,
@@ -38,12 +44,45 @@ _ALLOWED_TRANSITIONS = {
 }
 
 
+# Small-int state codes and, per code, a bitmask of the codes it may move to
+_STATES: Tuple[ParkingRequestState, ...] = tuple(ParkingRequestState)
+_STATE_CODES: Dict[ParkingRequestState, int] = {state: code for code, state in enumerate(_STATES)}
+_ALLOWED_MASKS: Tuple[int, ...] = tuple(
+    sum(1 << _STATE_CODES[target] for target in _ALLOWED_TRANSITIONS.get(state, ()))
+    for state in _STATES
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _ns_to_datetime(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
 class ParkingRequest:
+    # Requests are kept for the lifetime of the process, so avoid a per-instance
+    # __dict__ and store state as a small int and timestamps as epoch nanoseconds.
+    __slots__ = (
+        "_request_id",
+        "_vehicle_id",
+        "_preferred_zone_id",
+        "_required_features",
+        "_allocated_zone_id",
+        "_allocated_area_id",
+        "_allocated_slot_id",
+        "_state_code",
+        "_created_ns",
+        "_updated_ns",
+        "_version",
+        "_state_listener",
+    )
+
     def __init__(
         self,
         request_id: str,
         vehicle_id: str,
         preferred_zone_id: str,
+        required_features: SlotFeature = SlotFeature.NONE,
     ) -> None:
         if not request_id or not vehicle_id or not preferred_zone_id:
             raise ValueError("request_id, vehicle_id, and preferred_zone_id are required")
@@ -51,14 +90,20 @@ class ParkingRequest:
         self._request_id: str = request_id
         self._vehicle_id: str = vehicle_id
         self._preferred_zone_id: str = preferred_zone_id
+        self._required_features: SlotFeature = SlotFeature(required_features)
 
         self._allocated_zone_id: Optional[str] = None
         self._allocated_area_id: Optional[str] = None
         self._allocated_slot_id: Optional[str] = None
 
-        self._state: ParkingRequestState = ParkingRequestState.NEW
-        self._created_at: datetime = datetime.now(timezone.utc)
-        self._updated_at: datetime = self._created_at
+        self._state_code: int = _STATE_CODES[ParkingRequestState.NEW]
+        self._created_ns: int = time.time_ns()
+        self._updated_ns: int = self._created_ns
+        # Bumped on every state or allocation change; used for HTTP caching
+        self._version: int = 0
+        self._state_listener: Optional[
+            Callable[["ParkingRequest", ParkingRequestState], None]
+        ] = None
 
     # ---------- Properties ----------
 
@@ -74,6 +119,10 @@ class ParkingRequest:
     def preferred_zone_id(self) -> str:
         return self._preferred_zone_id
 
+    @property
+    def required_features(self) -> SlotFeature:
+        return self._required_features
+
     @property
     def allocated_zone_id(self) -> Optional[str]:
         return self._allocated_zone_id
@@ -88,33 +137,62 @@ class ParkingRequest:
 
     @property
     def state(self) -> ParkingRequestState:
-        return self._state
+        return _STATES[self._state_code]
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     @property
     def created_at(self) -> datetime:
-        return self._created_at
+        return _ns_to_datetime(self._created_ns)
 
     @property
     def updated_at(self) -> datetime:
-        return self._updated_at
+        return _ns_to_datetime(self._updated_ns)
+
+    @property
+    def created_at_ns(self) -> int:
+        return self._created_ns
+
+    @property
+    def updated_at_ns(self) -> int:
+        return self._updated_ns
 
     # ---------- State Management ----------
 
     def transition_to(self, new_state: ParkingRequestState) -> None:
-        allowed = _ALLOWED_TRANSITIONS.get(self._state, set())
+        previous = self._state_code
+        code = _STATE_CODES[new_state]
 
-        if new_state not in allowed:
+        if not _ALLOWED_MASKS[previous] >> code & 1:
             raise ParkingRequestError(
-                f"Illegal transition: {self._state} → {new_state}"
+                f"Illegal transition: {_STATES[previous]} → {new_state}"
             )
 
-        self._state = new_state
-        self._updated_at = datetime.now(timezone.utc)
+        self._state_code = code
+        self._updated_ns = time.time_ns()
+        self._version += 1
+        if self._state_listener is not None:
+            self._state_listener(self, _STATES[previous])
+
+    def restore_state(self, state: ParkingRequestState) -> None:
+        """Force the request back to ``state`` without transition checks (rollback only)."""
+        previous = self._state_code
+        self._state_code = _STATE_CODES[state]
+        self._version += 1
+        if self._state_listener is not None and previous != self._state_code:
+            self._state_listener(self, _STATES[previous])
+
+    def set_state_listener(
+        self, listener: Optional[Callable[["ParkingRequest", ParkingRequestState], None]]
+    ) -> None:
+        self._state_listener = listener
 
     # ---------- Allocation Binding ----------
 
     def bind_allocation(self, zone_id: str, slot_id: str) -> None:
-        if self._state != ParkingRequestState.ALLOCATING:
+        if self._state_code != _STATE_CODES[ParkingRequestState.ALLOCATING]:
             raise ParkingRequestError(
                 "Allocation can only be bound during ALLOCATING state"
             )
@@ -1,17 +1,44 @@
-from typing import Optional
+from enum import IntFlag
+from typing import Iterable, List, Optional
 
 
 class ParkingSlotError(Exception):
     pass
 
 
+class SlotFeature(IntFlag):
+    NONE = 0
+    EV_CHARGING = 1
+    ACCESSIBLE = 2
+    OVERSIZED = 4
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "SlotFeature":
+        features = cls.NONE
+        for name in names:
+            member = cls.__members__.get(str(name).upper())
+            if member is None or member is cls.NONE:
+                raise ValueError(f"Unknown slot feature '{name}'")
+            features |= member
+        return features
+
+    def to_names(self) -> List[str]:
+        return [member.name for member in SlotFeature if member and member in self]
+
+
 class ParkingSlot:
-    def __init__(self, slot_id: str, area_id: str) -> None:
+    def __init__(
+        self,
+        slot_id: str,
+        area_id: str,
+        features: SlotFeature = SlotFeature.NONE,
+    ) -> None:
         if not slot_id or not area_id:
             raise ValueError("slot_id and area_id must be non-empty strings")
 
         self._slot_id: str = slot_id
         self._area_id: str = area_id
+        self._features: SlotFeature = SlotFeature(features)
         self._is_available: bool = True
         self._current_vehicle_id: Optional[str] = None
 
@@ -23,6 +50,10 @@ class ParkingSlot:
     def area_id(self) -> str:
         return self._area_id
 
+    @property
+    def features(self) -> SlotFeature:
+        return self._features
+
     @property
     def is_available(self) -> bool:
         return self._is_available
@@ -31,6 +62,9 @@ class ParkingSlot:
     def current_vehicle_id(self) -> Optional[str]:
         return self._current_vehicle_id
 
+    def supports(self, required: SlotFeature) -> bool:
+        return self._features & required == required
+
     def allocate(self, vehicle_id: str) -> None:
         if not vehicle_id:
             raise ValueError("vehicle_id must be a non-empty string")
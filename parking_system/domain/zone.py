@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .parking_area import ParkingArea, ParkingAreaError
+from .parking_slot import ParkingSlot, SlotFeature
 
 
 
@@ -36,6 +37,15 @@ class Zone:
     def areas(self) -> List[ParkingArea]:
         return list(self._areas.values())
 
+    @property
+    def version(self) -> int:
+        # Area versions only grow, so their sum changes whenever any area does
+        return sum(area.version for area in self._areas.values())
+
+    @property
+    def is_closed(self) -> bool:
+        return all(area.is_closed for area in self._areas.values())
+
     # ---------- Queries ----------
     def get_area(self, area_id: str) -> ParkingArea:
         area = self._areas.get(area_id)
@@ -43,6 +53,15 @@ class Zone:
             raise ZoneError(f"Area ID '{area_id}' does not exist in this zone")
         return area
 
+    def find_available_slot(
+        self, required: SlotFeature = SlotFeature.NONE
+    ) -> Optional[ParkingSlot]:
+        for area in self._areas.values():
+            slot = area.find_available_slot(required)
+            if slot is not None:
+                return slot
+        return None
+
     def total_capacity(self) -> int:
         return sum(area.total_capacity() for area in self._areas.values())
 
@@ -1,8 +1,9 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timezone
 import uuid
 
-from domain.zone import Zone
+from domain.zone import Zone, ZoneError
+from domain.parking_area import ParkingArea
 from domain.parking_request import ParkingRequest, ParkingRequestState, ParkingRequestError
 from domain.parking_slot import ParkingSlot, ParkingSlotError
 
@@ -18,65 +19,152 @@ class OperationRecord:
         request_id: str,
         slot_id: str,
         prev_slot_state: bool,
-        prev_request_state: ParkingRequestState,
+        prev_request_state: Optional[ParkingRequestState],
+        zone_id: Optional[str] = None,
+        area_id: Optional[str] = None,
     ):
         self.operation_id: str = str(uuid.uuid4())
         self.operation_type: str = operation_type
         self.request_id: str = request_id
         self.slot_id: str = slot_id
+        self.zone_id: Optional[str] = zone_id
+        self.area_id: Optional[str] = area_id
         self.prev_slot_state: bool = prev_slot_state
-        self.prev_request_state: ParkingRequestState = prev_request_state
+        self.prev_request_state: Optional[ParkingRequestState] = prev_request_state
         self.timestamp: datetime = datetime.now(timezone.utc)
 
+    def describe(self) -> str:
+        return f"{self.operation_type} {self.request_id} on slot {self.slot_id}"
+
+
+class SlotMove(NamedTuple):
+    request_id: str
+    from_zone_id: str
+    from_area_id: str
+    from_slot_id: str
+    to_zone_id: str
+    to_area_id: str
+    to_slot_id: str
+
+
+class MaintenanceRecord(OperationRecord):
+    def __init__(
+        self,
+        operation_type: str,
+        zone_id: str,
+        area_id: Optional[str],
+        prev_closed: Dict[str, bool],
+        moves: List[SlotMove],
+    ):
+        super().__init__(
+            operation_type=operation_type,
+            request_id="",
+            slot_id="",
+            prev_slot_state=False,
+            prev_request_state=None,
+            zone_id=zone_id,
+            area_id=area_id,
+        )
+        self.prev_closed: Dict[str, bool] = prev_closed
+        self.moves: List[SlotMove] = moves
+
+    def describe(self) -> str:
+        target = f"{self.zone_id}/{self.area_id}" if self.area_id else self.zone_id
+        if self.moves:
+            return f"{self.operation_type} {target} ({len(self.moves)} requests moved)"
+        return f"{self.operation_type} {target}"
+
 
 class AllocationEngine:
     def __init__(self, zones: Dict[str, Zone]):
         self._zones: Dict[str, Zone] = zones
         self._operations: List[OperationRecord] = []
+        # (zone_id, area_id, slot_id) -> request currently holding that slot
+        self._slot_requests: Dict[Tuple[str, str, str], ParkingRequest] = {}
 
     # ---------- Allocation ----------
     def allocate(self, request: ParkingRequest) -> None:
         if request.state != ParkingRequestState.VALIDATED:
             raise AllocationError("Request must be VALIDATED to allocate")
 
-        # Step 1: try same-zone allocation
-        zone = self._zones.get(request.preferred_zone_id)
-        slot = self._find_available_slot(zone) if zone else None
+        # Step 0: transition to ALLOCATING state
+        request.transition_to(ParkingRequestState.ALLOCATING)
 
-        # Step 2: fallback to other zones
-        if not slot:
-            for z in self._zones.values():
-                if z.zone_id == request.preferred_zone_id:
-                    continue
-                slot = self._find_available_slot(z)
-                if slot:
-                    break
+        # Steps 1-2: preferred zone first, then cross-zone fallback
+        allocated_zone, slot = self._find_slot_for(request)
 
-        if not slot:
+        # Step 3: no slots anywhere → FAILED
+        if not slot or not allocated_zone:
             request.transition_to(ParkingRequestState.FAILED)
             raise AllocationError("No slots available in any zone")
 
-        # Step 3: record previous state
+        # Steps 4-5: record and perform allocation
+        self._commit_allocation(request, allocated_zone, slot)
+
+    def _commit_allocation(self, request: ParkingRequest, zone: Zone, slot: ParkingSlot) -> None:
         op = OperationRecord(
             operation_type="ALLOCATE",
             request_id=request.request_id,
             slot_id=slot.slot_id,
             prev_slot_state=slot.is_available,
             prev_request_state=request.state,
+            zone_id=zone.zone_id,
+            area_id=slot.area_id,
         )
+        # Record only once the slot is taken, so a failed allocation leaves no operation to roll back
+        zone.get_area(slot.area_id).allocate_slot(slot.slot_id, request.vehicle_id)
         self._operations.append(op)
-
-        # Step 4: perform allocation
-        slot.allocate(request.vehicle_id)
         request.transition_to(ParkingRequestState.ALLOCATED)
-        request._allocated_zone_id = slot.area_id  # temporary direct binding
-        request._allocated_slot_id = slot.slot_id
+        self._bind(request, zone.zone_id, slot.area_id, slot.slot_id)
+
+    def _find_slot_for(
+        self, request: ParkingRequest
+    ) -> Tuple[Optional[Zone], Optional[ParkingSlot]]:
+        required = request.required_features
+
+        # preferred zone first
+        preferred_zone = self._zones.get(request.preferred_zone_id)
+        if preferred_zone:
+            slot = preferred_zone.find_available_slot(required)
+            if slot:
+                return preferred_zone, slot
+
+        # cross-zone fallback with penalty scoring
+        sorted_zones = sorted(
+            (z for z in self._zones.values() if z.zone_id != request.preferred_zone_id),
+            key=lambda z: getattr(z, "penalty", 1),  # default penalty=1
+        )
+        for z in sorted_zones:
+            slot = z.find_available_slot(required)
+            if slot:
+                return z, slot
+        return None, None
+
+    def free_capacity(self) -> int:
+        return sum(
+            area.available_count()
+            for zone in self._zones.values()
+            for area in zone.areas
+            if not area.is_closed
+        )
 
-    def _find_available_slot(self, zone: Zone) -> Optional[ParkingSlot]:
-        for area in zone.areas:
-            for slot in area.available_slots:
-                return slot
-        return None
+    # ---------- Slot Ownership ----------
+    def _bind(self, request: ParkingRequest, zone_id: str, area_id: str, slot_id: str) -> None:
+        request._allocated_zone_id = zone_id
+        request._allocated_area_id = area_id
+        request._allocated_slot_id = slot_id
+        request._version += 1
+        self._slot_requests[(zone_id, area_id, slot_id)] = request
+
+    def _unbind(self, request: ParkingRequest) -> None:
+        self._slot_requests.pop(
+            (request.allocated_zone_id, request.allocated_area_id, request.allocated_slot_id),
+            None,
+        )
+        request._allocated_zone_id = None
+        request._allocated_area_id = None
+        request._allocated_slot_id = None
+        request._version += 1
 
     # ---------- Release ----------
     def release(self, request: ParkingRequest) -> None:
@@ -97,66 +185,123 @@ class AllocationEngine:
             slot_id=slot.slot_id,
             prev_slot_state=slot.is_available,
             prev_request_state=request.state,
+            zone_id=zone.zone_id,
+            area_id=area.area_id,
         )
         self._operations.append(op)
 
         # perform release
-        slot.release()
+        area.release_slot(slot.slot_id)
+        self._slot_requests.pop((zone.zone_id, area.area_id, slot.slot_id), None)
         # Transition through ACTIVE state before COMPLETED
         request.transition_to(ParkingRequestState.ACTIVE)
         request.transition_to(ParkingRequestState.COMPLETED)
 
-    def allocate(self, request: ParkingRequest) -> None:
-        if request.state != ParkingRequestState.VALIDATED:
-            raise AllocationError("Request must be VALIDATED to allocate")
+    # ---------- Maintenance ----------
+    def close_area(self, zone_id: str, area_id: Optional[str] = None) -> MaintenanceRecord:
+        areas = self._target_areas(zone_id, area_id)
+        op = MaintenanceRecord("CLOSE", zone_id, area_id, self._closed_flags(areas), [])
+        for area in areas:
+            area.close()
+        self._operations.append(op)
+        return op
 
-        # Step 0: transition to ALLOCATING state
-        request.transition_to(ParkingRequestState.ALLOCATING)
+    def reopen_area(self, zone_id: str, area_id: Optional[str] = None) -> MaintenanceRecord:
+        areas = self._target_areas(zone_id, area_id)
+        op = MaintenanceRecord("REOPEN", zone_id, area_id, self._closed_flags(areas), [])
+        for area in areas:
+            area.reopen()
+        self._operations.append(op)
+        return op
 
-        # Step 1: preferred zone first
-        preferred_zone = self._zones.get(request.preferred_zone_id)
-        slot = None
-        allocated_zone = None
-        if preferred_zone:
-            slot = self._find_available_slot(preferred_zone)
-            allocated_zone = preferred_zone
-
-        # Step 2: cross-zone fallback with penalty scoring
-        if not slot:
-            sorted_zones = sorted(
-                (z for z in self._zones.values() if z.zone_id != request.preferred_zone_id),
-                key=lambda z: getattr(z, "penalty", 1),  # default penalty=1
-            )
-            for z in sorted_zones:
-                slot = self._find_available_slot(z)
-                if slot:
-                    allocated_zone = z
-                    break
+    def drain_area(self, zone_id: str, area_id: Optional[str] = None) -> MaintenanceRecord:
+        """Close the target and move every vehicle parked in it elsewhere.
 
-        # Step 3: no slots anywhere → FAILED
-        if not slot or not allocated_zone:
-            request.transition_to(ParkingRequestState.FAILED)
-            raise AllocationError("No slots available in any zone")
+        Either all requests are moved or none are; the whole drain is logged
+        as one operation so a single rollback restores the previous layout.
+        """
+        areas = self._target_areas(zone_id, area_id)
+        prev_closed = self._closed_flags(areas)
+        for area in areas:
+            area.close()
 
-        # Step 4: record operation
-        op = OperationRecord(
-            operation_type="ALLOCATE",
+        moves: List[SlotMove] = []
+        try:
+            for area in areas:
+                for slot in area.slots:
+                    if slot.is_available:
+                        continue
+                    request = self._slot_requests.get((zone_id, area.area_id, slot.slot_id))
+                    if request is None:
+                        raise AllocationError(
+                            f"Slot {slot.slot_id} in area {area.area_id} has no tracked request"
+                        )
+                    moves.append(self._move(request))
+        except AllocationError:
+            for move in reversed(moves):
+                self._undo_move(move)
+            for area in areas:
+                if not prev_closed[area.area_id]:
+                    area.reopen()
+            raise
+
+        op = MaintenanceRecord("DRAIN", zone_id, area_id, prev_closed, moves)
+        self._operations.append(op)
+        return op
+
+    def _move(self, request: ParkingRequest) -> SlotMove:
+        target_zone, target_slot = self._find_slot_for(request)
+        if not target_zone or not target_slot:
+            raise AllocationError(f"No open slot to move request {request.request_id} to")
+
+        move = SlotMove(
             request_id=request.request_id,
-            slot_id=slot.slot_id,
-            prev_slot_state=slot.is_available,
-            prev_request_state=request.state,
+            from_zone_id=request.allocated_zone_id,
+            from_area_id=request.allocated_area_id,
+            from_slot_id=request.allocated_slot_id,
+            to_zone_id=target_zone.zone_id,
+            to_area_id=target_slot.area_id,
+            to_slot_id=target_slot.slot_id,
         )
-        self._operations.append(op)
+        self._relocate(
+            request,
+            (move.from_zone_id, move.from_area_id, move.from_slot_id),
+            (move.to_zone_id, move.to_area_id, move.to_slot_id),
+        )
+        return move
 
-        # Step 5: perform allocation
-        slot.allocate(request.vehicle_id)
-        request.transition_to(ParkingRequestState.ALLOCATED)
-        request._allocated_zone_id = allocated_zone.zone_id
-        request._allocated_area_id = slot.area_id
-        request._allocated_slot_id = slot.slot_id
-
-    def _find_available_slot(self, zone: Zone) -> Optional[ParkingSlot]:
-        for area in zone.areas:
-            for slot in area.available_slots:
-                return slot
-        return None
\ No newline at end of file
+    def _undo_move(self, move: SlotMove) -> None:
+        target = (move.to_zone_id, move.to_area_id, move.to_slot_id)
+        self._relocate(
+            self._slot_requests[target],
+            target,
+            (move.from_zone_id, move.from_area_id, move.from_slot_id),
+        )
+
+    def _relocate(
+        self,
+        request: ParkingRequest,
+        source: Tuple[str, str, str],
+        target: Tuple[str, str, str],
+    ) -> None:
+        from_zone_id, from_area_id, from_slot_id = source
+        to_zone_id, to_area_id, to_slot_id = target
+        self._zones[from_zone_id].get_area(from_area_id).release_slot(from_slot_id)
+        self._zones[to_zone_id].get_area(to_area_id).allocate_slot(to_slot_id, request.vehicle_id)
+        self._unbind(request)
+        self._bind(request, to_zone_id, to_area_id, to_slot_id)
+
+    def _target_areas(self, zone_id: str, area_id: Optional[str]) -> List[ParkingArea]:
+        zone = self._zones.get(zone_id)
+        if not zone:
+            raise AllocationError(f"Zone {zone_id} not found")
+        if area_id is None:
+            return zone.areas
+        try:
+            return [zone.get_area(area_id)]
+        except ZoneError as e:
+            raise AllocationError(str(e)) from e
+
+    @staticmethod
+    def _closed_flags(areas: List[ParkingArea]) -> Dict[str, bool]:
+        return {area.area_id: area.is_closed for area in areas}
@@ -20,11 +20,8 @@ class AnalyticsEngine:
         ]
         if not completed:
             return 0.0
-        total_duration = 0.0
-        for r in completed:
-            if r.created_at and r.updated_at:
-                total_duration += (r.updated_at - r.created_at).total_seconds()
-        return total_duration / len(completed)
+        total_ns = sum(r.updated_at_ns - r.created_at_ns for r in completed)
+        return total_ns / 1e9 / len(completed)
 
     def zone_utilization(self) -> Dict[str, float]:
         utilization = {}
@@ -0,0 +1,201 @@
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from domain.parking_area import ParkingAreaError
+from domain.parking_request import ParkingRequest, ParkingRequestState
+from domain.parking_slot import ParkingSlotError, SlotFeature
+from domain.zone import Zone, ZoneError
+from .allocation_engine import AllocationEngine, AllocationError
+
+
+# Costs are lexicographic: serve as many requests as possible, then avoid
+# cross-zone fallbacks, then avoid spending feature slots on plain requests.
+UNSERVED_COST = 1_000_000
+FALLBACK_COST = 1_000
+EXTRA_FEATURE_COST = 1
+
+_INF = float("inf")
+
+
+def min_cost_assignment(
+    supplies: Dict[Hashable, int],
+    capacities: Dict[Hashable, int],
+    cost: Callable[[Hashable, Hashable], Optional[int]],
+    unserved_cost: int = UNSERVED_COST,
+) -> Dict[Tuple[Hashable, Hashable], int]:
+    """Solve a transportation problem by successive shortest paths.
+
+    ``supplies`` are demand classes, ``capacities`` are slot pools, and
+    ``cost(cls, pool)`` is the per-unit cost or None if the pool cannot
+    serve the class. Each class may also stay unserved at ``unserved_cost``.
+    Returns the flow per (class, pool) pair; unserved units are omitted.
+    """
+    classes = [c for c, n in supplies.items() if n > 0]
+    pools = [p for p, n in capacities.items() if n > 0]
+    source, sink = 0, 1
+    class_node = {c: 2 + i for i, c in enumerate(classes)}
+    pool_node = {p: 2 + len(classes) + i for i, p in enumerate(pools)}
+    n_nodes = 2 + len(classes) + len(pools)
+
+    # Edge list: to, capacity, cost, index of reverse edge in graph[to]
+    graph: List[List[List]] = [[] for _ in range(n_nodes)]
+
+    def add_edge(u: int, v: int, cap: int, unit_cost: int) -> List:
+        forward = [v, cap, unit_cost, len(graph[v])]
+        graph[u].append(forward)
+        graph[v].append([u, 0, -unit_cost, len(graph[u]) - 1])
+        return forward
+
+    assignment_edges: List[Tuple[Hashable, Hashable, List, int]] = []
+    for c in classes:
+        supply = supplies[c]
+        add_edge(source, class_node[c], supply, 0)
+        add_edge(class_node[c], sink, supply, unserved_cost)
+        for p in pools:
+            unit_cost = cost(c, p)
+            if unit_cost is not None:
+                edge = add_edge(class_node[c], pool_node[p], supply, unit_cost)
+                assignment_edges.append((c, p, edge, supply))
+    for p in pools:
+        add_edge(pool_node[p], sink, capacities[p], 0)
+
+    remaining = sum(supplies[c] for c in classes)
+    while remaining > 0:
+        # Bellman-Ford queue (SPFA): residual edges can carry negative costs
+        dist = [_INF] * n_nodes
+        prev: List[Optional[Tuple[int, int]]] = [None] * n_nodes
+        in_queue = [False] * n_nodes
+        dist[source] = 0
+        queue: Deque[int] = deque([source])
+        while queue:
+            u = queue.popleft()
+            in_queue[u] = False
+            for i, (v, cap, unit_cost, _) in enumerate(graph[u]):
+                if cap > 0 and dist[u] + unit_cost < dist[v]:
+                    dist[v] = dist[u] + unit_cost
+                    prev[v] = (u, i)
+                    if not in_queue[v]:
+                        in_queue[v] = True
+                        queue.append(v)
+        if dist[sink] == _INF:
+            break
+
+        bottleneck = remaining
+        v = sink
+        while v != source:
+            u, i = prev[v]
+            bottleneck = min(bottleneck, graph[u][i][1])
+            v = u
+        v = sink
+        while v != source:
+            u, i = prev[v]
+            edge = graph[u][i]
+            edge[1] -= bottleneck
+            graph[v][edge[3]][1] += bottleneck
+            v = u
+        remaining -= bottleneck
+
+    flows: Dict[Tuple[Hashable, Hashable], int] = {}
+    for c, p, edge, initial in assignment_edges:
+        used = initial - edge[1]
+        if used > 0:
+            flows[(c, p)] = used
+    return flows
+
+
+class BatchAllocator:
+    """Allocates a window of requests together instead of first come, first served.
+
+    Requests are grouped into classes by (preferred zone, required features)
+    and free slots into pools by (zone, exact feature mask), so the solve is
+    sized by zones and feature combinations, not by requests or slots.
+    """
+
+    def __init__(self, engine: AllocationEngine):
+        self._engine = engine
+
+    def allocate_batch(self, requests: List[ParkingRequest]) -> List[Optional[AllocationError]]:
+        """Allocate every request; returns None or the AllocationError per request.
+
+        A request that cannot be placed is moved to FAILED on its own; the
+        rest of the batch keeps its allocations. No request is left
+        ALLOCATING, even if the solve raises.
+        """
+        results: List[Optional[AllocationError]] = [None] * len(requests)
+
+        classes: Dict[Tuple[str, int], List[int]] = {}
+        for i, request in enumerate(requests):
+            if request.state != ParkingRequestState.VALIDATED:
+                results[i] = AllocationError("Request must be VALIDATED to allocate")
+                continue
+            request.transition_to(ParkingRequestState.ALLOCATING)
+            key = (request.preferred_zone_id, int(request.required_features))
+            classes.setdefault(key, []).append(i)
+
+        try:
+            self._assign(requests, classes, results)
+        finally:
+            for i, request in enumerate(requests):
+                if request.state == ParkingRequestState.ALLOCATING:
+                    request.transition_to(ParkingRequestState.FAILED)
+                    results[i] = AllocationError("Batch allocation aborted")
+
+        return results
+
+    def _assign(
+        self,
+        requests: List[ParkingRequest],
+        classes: Dict[Tuple[str, int], List[int]],
+        results: List[Optional[AllocationError]],
+    ) -> None:
+        zones: Dict[str, Zone] = self._engine._zones
+
+        capacities: Dict[Tuple[str, int], int] = {}
+        for zone in zones.values():
+            for area in zone.areas:
+                for mask, count in enumerate(area.free_counts_by_features()):
+                    if count:
+                        pool = (zone.zone_id, mask)
+                        capacities[pool] = capacities.get(pool, 0) + count
+
+        def cost(cls: Tuple[str, int], pool: Tuple[str, int]) -> Optional[int]:
+            (preferred_zone_id, required), (zone_id, mask) = cls, pool
+            if mask & required != required:
+                return None
+            unit_cost = bin(mask & ~required).count("1") * EXTRA_FEATURE_COST
+            if zone_id != preferred_zone_id:
+                unit_cost += FALLBACK_COST * getattr(zones[zone_id], "penalty", 1)
+            return unit_cost
+
+        flows = min_cost_assignment(
+            {cls: len(members) for cls, members in classes.items()}, capacities, cost
+        )
+
+        # Hand out concrete slots: the earliest requests in each class get its cheapest pools.
+        for cls, members in classes.items():
+            pending = deque(members)
+            pools = sorted(
+                ((pool, count) for (flow_cls, pool), count in flows.items() if flow_cls == cls),
+                key=lambda item: (cost(cls, item[0]), item[0]),
+            )
+            for (zone_id, mask), count in pools:
+                zone = zones[zone_id]
+                for _ in range(count):
+                    i = pending.popleft()
+                    try:
+                        slot = self._find_exact(zone, SlotFeature(mask))
+                        self._engine._commit_allocation(requests[i], zone, slot)
+                    except (AllocationError, ParkingAreaError, ParkingSlotError, ZoneError) as e:
+                        requests[i].transition_to(ParkingRequestState.FAILED)
+                        results[i] = AllocationError(str(e))
+            for i in pending:
+                requests[i].transition_to(ParkingRequestState.FAILED)
+                results[i] = AllocationError("No slots available in any zone")
+
+    @staticmethod
+    def _find_exact(zone: Zone, mask: SlotFeature):
+        for area in zone.areas:
+            slot = area.find_free_slot_exact(mask)
+            if slot is not None:
+                return slot
+        raise AllocationError(f"Pool ({zone.zone_id}, {mask!r}) ran out of slots")
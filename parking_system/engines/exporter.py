@@ -0,0 +1,176 @@
+import csv
+import io
+import json
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from domain.parking_request import ParkingRequest
+from .allocation_engine import OperationRecord
+
+
+REQUEST_FIELDS: List[str] = [
+    "request_id",
+    "vehicle_id",
+    "preferred_zone_id",
+    "required_features",
+    "state",
+    "allocated_zone_id",
+    "allocated_area_id",
+    "allocated_slot_id",
+    "created_at",
+    "updated_at",
+]
+
+OPERATION_FIELDS: List[str] = [
+    "operation_id",
+    "operation_type",
+    "timestamp",
+    "request_id",
+    "zone_id",
+    "area_id",
+    "slot_id",
+    "prev_request_state",
+    "description",
+]
+
+# Rows serialized per yielded chunk; keeps chunks large enough to be cheap
+# to write and small enough that memory stays flat.
+DEFAULT_CHUNK_ROWS = 1000
+
+
+class ExportError(Exception):
+    pass
+
+
+# ---------- Records ----------
+def request_record(req: ParkingRequest) -> Dict[str, Any]:
+    return {
+        "request_id": req.request_id,
+        "vehicle_id": req.vehicle_id,
+        "preferred_zone_id": req.preferred_zone_id,
+        "required_features": "|".join(req.required_features.to_names()),
+        "state": req.state.value,
+        "allocated_zone_id": req.allocated_zone_id,
+        "allocated_area_id": req.allocated_area_id,
+        "allocated_slot_id": req.allocated_slot_id,
+        "created_at": req.created_at.isoformat(),
+        "updated_at": req.updated_at.isoformat(),
+    }
+
+
+def operation_record(op: OperationRecord) -> Dict[str, Any]:
+    return {
+        "operation_id": op.operation_id,
+        "operation_type": op.operation_type,
+        "timestamp": op.timestamp.isoformat(),
+        "request_id": op.request_id or None,
+        "zone_id": op.zone_id,
+        "area_id": op.area_id,
+        "slot_id": op.slot_id or None,
+        "prev_request_state": op.prev_request_state.value if op.prev_request_state else None,
+        "description": op.describe(),
+    }
+
+
+def iter_operations(
+    operations: List[OperationRecord],
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    operation_type: Optional[str] = None,
+) -> Iterator[OperationRecord]:
+    """Iterate logged operations oldest first, reading the live log by position.
+
+    The bounds are bisected here, before the first item is drawn. Rollbacks
+    pop from the end of the log, so the length is re-checked on every step
+    instead of copying the list up front.
+    """
+    lo = 0
+    hi = len(operations)
+    if created_after is not None:
+        lo = bisect_left(operations, created_after, hi=hi, key=lambda op: op.timestamp)
+    if created_before is not None:
+        hi = bisect_right(operations, created_before, lo=lo, hi=hi, key=lambda op: op.timestamp)
+    return _iter_log(operations, lo, hi, operation_type)
+
+
+def _iter_log(
+    operations: List[OperationRecord], lo: int, hi: int, operation_type: Optional[str]
+) -> Iterator[OperationRecord]:
+    i = lo
+    while i < hi and i < len(operations):
+        op = operations[i]
+        i += 1
+        if operation_type is None or op.operation_type == operation_type:
+            yield op
+
+
+# ---------- Encoders ----------
+def iter_ndjson(
+    records: Iterable[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    lines: List[str] = []
+    for record in records:
+        lines.append(json.dumps(record, separators=(",", ":")))
+        if len(lines) >= chunk_rows:
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8")
+            lines = []
+    if lines:
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+
+
+def iter_csv(
+    records: Iterable[Dict[str, Any]],
+    fields: List[str],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    rows = 0
+    for record in records:
+        writer.writerow(record)
+        rows += 1
+        if rows >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+ENCODERS: Dict[str, Callable[[Iterable[Dict[str, Any]], List[str]], Iterator[bytes]]] = {
+    "ndjson": lambda records, fields: iter_ndjson(records),
+    "csv": iter_csv,
+}
+
+MIMETYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def encode(
+    records: Iterable[Dict[str, Any]],
+    fields: List[str],
+    fmt: str = "ndjson",
+    compress: bool = False,
+) -> Iterator[bytes]:
+    encoder = ENCODERS.get(fmt)
+    if encoder is None:
+        raise ExportError(f"Unknown export format '{fmt}'")
+    chunks = encoder(records, fields)
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,161 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from domain.parking_request import ParkingRequest, ParkingRequestState
+
+
+class RequestIndexError(Exception):
+    pass
+
+
+class RequestIndex:
+    """Secondary indexes over submitted requests for filtered, paginated listing.
+
+    Every request gets a sequence number in submission order. Each index keeps
+    a sorted list of sequence numbers, so a page is found with a bisect and
+    read in O(page size) instead of scanning the registry. The state index is
+    updated from the requests' state-change callbacks.
+    """
+
+    def __init__(self) -> None:
+        self._requests: List[ParkingRequest] = []  # position == sequence number
+        self._created: List[float] = []  # creation timestamps, non-decreasing
+        self._seq_of: Dict[str, int] = {}
+        self._by_state: Dict[ParkingRequestState, List[int]] = {}
+        self._by_zone: Dict[str, List[int]] = {}
+        self._by_vehicle: Dict[str, List[int]] = {}
+        # Bound once and shared by every indexed request; a bound method per
+        # request would cost 64 bytes each
+        self._state_listener = self._on_state_change
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    # ---------- Maintenance ----------
+    def add(self, request: ParkingRequest) -> None:
+        if request.request_id in self._seq_of:
+            raise RequestIndexError(f"Request {request.request_id} is already indexed")
+
+        seq = len(self._requests)
+        created = request.created_at_ns / 1e9
+        if self._created and created < self._created[-1]:
+            created = self._created[-1]  # keep the list sorted if the clock steps back
+
+        self._requests.append(request)
+        self._created.append(created)
+        self._seq_of[request.request_id] = seq
+        self._by_state.setdefault(request.state, []).append(seq)
+        self._by_zone.setdefault(request.preferred_zone_id, []).append(seq)
+        self._by_vehicle.setdefault(request.vehicle_id, []).append(seq)
+
+        request.set_state_listener(self._state_listener)
+
+    def _on_state_change(self, request: ParkingRequest, previous: ParkingRequestState) -> None:
+        seq = self._seq_of[request.request_id]
+        old = self._by_state.get(previous)
+        if old:
+            pos = bisect_left(old, seq)
+            if pos < len(old) and old[pos] == seq:
+                del old[pos]
+        insort(self._by_state.setdefault(request.state, []), seq)
+
+    # ---------- Queries ----------
+    def query(
+        self,
+        state: Optional[ParkingRequestState] = None,
+        zone_id: Optional[str] = None,
+        vehicle_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[ParkingRequest], Optional[str]]:
+        """Return up to ``limit`` matching requests, newest first, and the next cursor."""
+        if limit <= 0:
+            raise RequestIndexError("limit must be a positive integer")
+
+        lo = 0
+        hi = len(self._requests)
+        if created_after is not None:
+            lo = bisect_left(self._created, created_after.timestamp())
+        if created_before is not None:
+            hi = bisect_right(self._created, created_before.timestamp())
+        if cursor is not None:
+            hi = min(hi, self._decode_cursor(cursor))
+
+        candidates: List[List[int]] = []
+        if state is not None:
+            candidates.append(self._by_state.get(state, []))
+        if zone_id is not None:
+            candidates.append(self._by_zone.get(zone_id, []))
+        if vehicle_id is not None:
+            candidates.append(self._by_vehicle.get(vehicle_id, []))
+
+        if candidates:
+            # Walk the most selective index and check the remaining filters per row.
+            seqs = min(candidates, key=len)
+            end = bisect_left(seqs, hi)
+            start = bisect_left(seqs, lo)
+            walk = (seqs[i] for i in range(end - 1, start - 1, -1))
+        else:
+            walk = iter(range(hi - 1, lo - 1, -1))
+
+        page: List[ParkingRequest] = []
+        for seq in walk:
+            request = self._requests[seq]
+            if state is not None and request.state != state:
+                continue
+            if zone_id is not None and request.preferred_zone_id != zone_id:
+                continue
+            if vehicle_id is not None and request.vehicle_id != vehicle_id:
+                continue
+            if len(page) == limit:
+                return page, self._encode_cursor(self._seq_of[page[-1].request_id])
+            page.append(request)
+
+        return page, None
+
+    def iter_range(
+        self,
+        state: Optional[ParkingRequestState] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Iterator[ParkingRequest]:
+        """Iterate matching requests oldest first, without copying any index.
+
+        The bounds are resolved here, before the first item is drawn, so a
+        bad bound fails the call rather than a stream already in flight.
+        Requests submitted meanwhile are appended past the upper bound and
+        are safe to ignore.
+        """
+        lo = 0
+        hi = len(self._requests)
+        if created_after is not None:
+            lo = bisect_left(self._created, created_after.timestamp())
+        if created_before is not None:
+            hi = bisect_right(self._created, created_before.timestamp(), hi=hi)
+        return self._iter_seq(lo, hi, state)
+
+    def _iter_seq(
+        self, lo: int, hi: int, state: Optional[ParkingRequestState]
+    ) -> Iterator[ParkingRequest]:
+        requests = self._requests
+        for seq in range(lo, hi):
+            request = requests[seq]
+            if state is None or request.state == state:
+                yield request
+
+    @staticmethod
+    def _encode_cursor(seq: int) -> str:
+        return format(seq, "x")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> int:
+        try:
+            seq = int(cursor, 16)
+        except ValueError as e:
+            raise RequestIndexError(f"Invalid cursor '{cursor}'") from e
+        if seq < 0:
+            raise RequestIndexError(f"Invalid cursor '{cursor}'")
+        return seq
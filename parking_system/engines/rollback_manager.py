@@ -1,7 +1,9 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from domain.parking_request import ParkingRequest, ParkingRequestState
 from domain.parking_slot import ParkingSlot, ParkingSlotError
-from .allocation_engine import AllocationEngine, OperationRecord
+from domain.parking_area import ParkingArea, ParkingAreaError
+from domain.zone import ZoneError
+from .allocation_engine import AllocationEngine, MaintenanceRecord, OperationRecord
 
 
 class RollbackError(Exception):
@@ -11,7 +13,7 @@ class RollbackError(Exception):
 class RollbackManager:
     def __init__(self, engine: AllocationEngine, requests_registry: Dict[str, ParkingRequest] = None):
         self._engine = engine
-        self._requests_registry = requests_registry or {}
+        self._requests_registry = requests_registry if requests_registry is not None else {}
 
     def set_requests_registry(self, registry: Dict[str, ParkingRequest]) -> None:
         """Set the requests registry after initialization"""
@@ -29,34 +31,55 @@ class RollbackManager:
             self._restore_operation(op)
 
     def _restore_operation(self, op: OperationRecord) -> None:
+        if isinstance(op, MaintenanceRecord):
+            self._restore_maintenance(op)
+            return
+
         # Find the request from registry
         request: ParkingRequest = self._requests_registry.get(op.request_id)
         if not request:
             raise RollbackError(f"Request {op.request_id} not found in registry")
         
-        # Find the slot
-        slot: ParkingSlot = self._find_slot(op.slot_id)
+        # Find the area and slot
+        area, slot = self._find_area_and_slot(op)
 
         if op.operation_type == "ALLOCATE":
             if not slot.is_available:  # only release if allocated
-                slot.release()
-            request._state = op.prev_request_state
-            request._allocated_slot_id = None
-            request._allocated_zone_id = None
-            request._allocated_area_id = None
+                area.release_slot(slot.slot_id)
+            request.restore_state(op.prev_request_state)
+            self._engine._unbind(request)
 
         elif op.operation_type == "RELEASE":
             if slot.is_available:  # only allocate if free
-                slot.allocate(request.vehicle_id)
-            request._state = op.prev_request_state
-            request._allocated_slot_id = slot.slot_id
-            request._allocated_zone_id = slot.area_id  # This will be fixed with proper area tracking
-            request._allocated_area_id = slot.area_id
-
-    def _find_slot(self, slot_id: str) -> ParkingSlot:
-        for zone in self._engine._zones.values():
+                area.allocate_slot(slot.slot_id, request.vehicle_id)
+            request.restore_state(op.prev_request_state)
+            self._engine._bind(request, area.zone_id, area.area_id, slot.slot_id)
+
+    def _restore_maintenance(self, op: MaintenanceRecord) -> None:
+        for move in reversed(op.moves):
+            self._engine._undo_move(move)
+
+        zone = self._engine._zones.get(op.zone_id)
+        if not zone:
+            raise RollbackError(f"Zone {op.zone_id} not found")
+        for area_id, was_closed in op.prev_closed.items():
+            area = zone.get_area(area_id)
+            if was_closed:
+                area.close()
+            else:
+                area.reopen()
+
+    def _find_area_and_slot(self, op: OperationRecord) -> Tuple[ParkingArea, ParkingSlot]:
+        zones = self._engine._zones
+        if op.zone_id in zones:
+            try:
+                area = zones[op.zone_id].get_area(op.area_id)
+                return area, area.get_slot(op.slot_id)
+            except (ZoneError, ParkingAreaError):
+                pass
+        for zone in zones.values():
             for area in zone.areas:
                 for slot in area.slots:
-                    if slot.slot_id == slot_id:
-                        return slot
-        raise RollbackError(f"Slot {slot_id} not found")
+                    if slot.slot_id == op.slot_id:
+                        return area, slot
+        raise RollbackError(f"Slot {op.slot_id} not found")
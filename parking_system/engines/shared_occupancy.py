@@ -0,0 +1,490 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from domain.parking_area import _FEATURE_COMBINATIONS, ParkingArea
+from domain.parking_request import _STATE_CODES, _STATES, ParkingRequest, ParkingRequestState, _ns_to_datetime
+from domain.parking_slot import SlotFeature
+from domain.zone import Zone
+from .snapshot_manager import AreaSnapshot, ZoneSnapshot
+
+
+_MAGIC = b"PKOC"
+_LAYOUT_VERSION = 1
+
+# Header: magic, layout, retired, zones_seq, generation, n_zones, n_areas,
+# request_capacity, dropped_requests, max_probe, writer_pid. zones_seq sits at offset 8.
+_HEADER = struct.Struct("<4sHHQQIIIIII")
+_HEADER_SIZE = 64
+_ZONES_SEQ_OFFSET = 8
+_RETIRED_OFFSET = 6
+_DROPPED_OFFSET = 36
+_MAX_PROBE_OFFSET = 40
+_WRITER_PID_OFFSET = 44
+
+# zone_id, name, first area index, area count
+_ZONE = struct.Struct("<16s48sII")
+# area_id, zone index, total, version, available, closed, free slots per exact feature mask
+_AREA = struct.Struct(f"<16sIIQII{_FEATURE_COMBINATIONS}I")
+# Each request entry is a u64 sequence word followed by the body.
+# request_id, vehicle_id, preferred_zone_id, required features, state code,
+# allocated zone/area index (-1 if none), allocated slot_id, created/updated ns, version
+_REQUEST_BODY = struct.Struct("<16s64s16sBBxxii32sqqQ")
+_REQUEST_STRIDE = 8 + _REQUEST_BODY.size + (-(8 + _REQUEST_BODY.size) % 8)
+# Key of an evicted entry; 0xff never occurs in UTF-8, so it matches no request ID
+_TOMBSTONE = b"\xff" * 16
+
+_FINISHED_CODES = frozenset(
+    _STATE_CODES[state]
+    for state in (
+        ParkingRequestState.COMPLETED,
+        ParkingRequestState.CANCELLED,
+        ParkingRequestState.FAILED,
+        ParkingRequestState.ROLLED_BACK,
+    )
+)
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+_READ_RETRIES = 10000
+_EMPTY_ENTRY = object()
+
+
+class SharedOccupancyError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RequestSnapshot:
+    """A request as last published by the writer; has the fields request_to_dict reads."""
+
+    request_id: str
+    vehicle_id: str
+    preferred_zone_id: str
+    required_features: SlotFeature
+    state: ParkingRequestState
+    allocated_zone_id: Optional[str]
+    allocated_area_id: Optional[str]
+    allocated_slot_id: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+
+def _encode(value: Optional[str], width: int) -> Optional[bytes]:
+    raw = (value or "").encode("utf-8")
+    return raw if len(raw) <= width else None
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+class SharedOccupancyTable:
+    """Zone, area and request occupancy in a fixed-layout shared-memory segment.
+
+    One writer process owns the ParkingSystem and publishes into the segment
+    after every change; any number of processes attach read-only. The
+    writer's pid is kept in the header: no other process may publish, and
+    create() will not replace a segment whose writer is still running. Writes
+    are guarded by sequence words (a seqlock): the writer makes a word odd,
+    writes the record and makes it even again, and readers retry until they
+    see the same even value before and after their read. Area counters share one word
+    so a /zones read is consistent across zones; each request entry has its own.
+
+    Requests live in an open-addressing hash table sized at creation. Above
+    3/4 load, the request that finished longest ago is evicted to make room,
+    so readers only lose the status of old finished requests. Requests that
+    still do not fit (every entry live, or over-long IDs) are counted in
+    ``dropped_requests`` and stay visible only to the writer.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+
+        (
+            magic, layout, _, _, generation, n_zones, n_areas, capacity, _, _, writer_pid,
+        ) = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or layout != _LAYOUT_VERSION:
+            raise SharedOccupancyError(f"Segment '{shm.name}' is not an occupancy table")
+
+        self._generation: int = generation
+        self._writer_pid: int = writer_pid
+        self._request_capacity: int = capacity
+        self._zones_offset = _HEADER_SIZE
+        self._areas_offset = self._zones_offset + n_zones * _ZONE.size
+        self._requests_offset = self._areas_offset + n_areas * _AREA.size
+        self._requests_offset += -self._requests_offset % 8
+
+        # Static topology, read once
+        self._zones: List[Tuple[str, str, int, int]] = []
+        for i in range(n_zones):
+            zone_id, name, first, count = _ZONE.unpack_from(self._buf, self._zones_offset + i * _ZONE.size)
+            self._zones.append((_decode(zone_id), _decode(name), first, count))
+        self._area_ids: List[str] = []
+        self._area_zones: List[int] = []
+        self._area_keys: List[bytes] = []
+        for i in range(n_areas):
+            area_id, zone_index = _AREA.unpack_from(self._buf, self._areas_offset + i * _AREA.size)[:2]
+            self._area_ids.append(_decode(area_id))
+            self._area_keys.append(area_id)
+            self._area_zones.append(zone_index)
+
+        # Writer-side bookkeeping; _areas are the live areas, in table order
+        self._areas: List[ParkingArea] = []
+        self._area_index: Dict[Tuple[str, str], int] = {}
+        self._zone_index: Dict[str, int] = {}
+        self._published_area_versions: List[int] = [-1] * n_areas
+        self._request_slots: Dict[str, int] = {}
+        # Published requests in a final state, oldest first; evicted when the table is full
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._max_probe: int = 0
+        self._zones_seq: int = 0
+        self._dropped: int = 0
+        # The seqlock allows one writer; threads of the owning process take turns
+        self._publish_lock = threading.Lock()
+        if owner:
+            for z, (zone_id, _, first, count) in enumerate(self._zones):
+                self._zone_index[zone_id] = z
+                for a in range(first, first + count):
+                    self._area_index[(zone_id, self._area_ids[a])] = a
+
+    # ---------- Lifecycle ----------
+    @classmethod
+    def create(cls, name: str, zones: Dict[str, Zone], request_capacity: int = 65536) -> "SharedOccupancyTable":
+        """Create the segment for ``zones``, replacing a stale one left under ``name``."""
+        if request_capacity <= 0:
+            raise ValueError("request_capacity must be positive")
+
+        zone_rows = []
+        area_rows = []
+        for zone in zones.values():
+            zone_id = _encode(zone.zone_id, 16)
+            zone_name = _encode(zone.name, 48)
+            if zone_id is None or zone_name is None:
+                raise SharedOccupancyError(f"Zone '{zone.zone_id}' ID or name is too long for the shared table")
+            zone_rows.append((zone_id, zone_name, len(area_rows), len(zone.areas)))
+            for area in zone.areas:
+                area_id = _encode(area.area_id, 16)
+                if area_id is None:
+                    raise SharedOccupancyError(f"Area ID '{area.area_id}' is too long for the shared table")
+                area_rows.append((area_id, len(zone_rows) - 1, area.total_capacity()))
+
+        requests_offset = _HEADER_SIZE + len(zone_rows) * _ZONE.size + len(area_rows) * _AREA.size
+        requests_offset += -requests_offset % 8
+        size = requests_offset + request_capacity * _REQUEST_STRIDE
+
+        try:
+            shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = SharedMemory(name=name)
+            magic = bytes(stale.buf[:4])
+            writer_pid = _U32.unpack_from(stale.buf, _WRITER_PID_OFFSET)[0] if stale.size >= _HEADER_SIZE else 0
+            if magic == b"\0" * 4 or (
+                magic == _MAGIC and writer_pid != os.getpid() and _pid_alive(writer_pid)
+            ):
+                # Attaching registered it with this process's tracker, which would unlink it at exit
+                resource_tracker.unregister(stale._name, "shared_memory")
+                stale.close()
+                raise SharedOccupancyError(
+                    f"Segment '{name}' belongs to running writer pid {writer_pid or '?'}; "
+                    "only one writer process may own it"
+                )
+            # Left behind by a writer that did not shut down cleanly
+            if magic == _MAGIC:
+                _U16.pack_into(stale.buf, _RETIRED_OFFSET, 1)
+            stale.unlink()
+            stale.close()
+            shm = SharedMemory(name=name, create=True, size=size)
+
+        buf = shm.buf
+        generation = time.time_ns()
+        _HEADER.pack_into(
+            buf, 0, _MAGIC, _LAYOUT_VERSION, 0, 0, generation,
+            len(zone_rows), len(area_rows), request_capacity, 0, 0, os.getpid(),
+        )
+        for i, row in enumerate(zone_rows):
+            _ZONE.pack_into(buf, _HEADER_SIZE + i * _ZONE.size, *row)
+        areas_offset = _HEADER_SIZE + len(zone_rows) * _ZONE.size
+        for i, (area_id, zone_index, total) in enumerate(area_rows):
+            _AREA.pack_into(
+                buf, areas_offset + i * _AREA.size, area_id, zone_index, total, 0, 0, 0,
+                *([0] * _FEATURE_COMBINATIONS),
+            )
+
+        table = cls(shm, owner=True)
+        table._areas = [area for zone in zones.values() for area in zone.areas]
+        table.publish()
+        return table
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedOccupancyTable":
+        """Attach read-only to an existing segment; raises FileNotFoundError if none."""
+        try:
+            shm = SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 tracks every attach and unlinks on exit
+            shm = SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    def retire(self) -> None:
+        """Mark the segment as replaced and unlink it; attached readers should reattach."""
+        _U16.pack_into(self._buf, _RETIRED_OFFSET, 1)
+        self._shm.unlink()
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+    # ---------- Properties ----------
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def generation(self) -> int:
+        """Changes every time the writer recreates the segment."""
+        return self._generation
+
+    @property
+    def is_retired(self) -> bool:
+        return bool(_U16.unpack_from(self._buf, _RETIRED_OFFSET)[0])
+
+    @property
+    def dropped_requests(self) -> int:
+        return _U32.unpack_from(self._buf, _DROPPED_OFFSET)[0]
+
+    # ---------- Writer ----------
+    def publish(self, requests: Iterable[ParkingRequest] = ()) -> None:
+        """Copy areas changed since the last publish and the given requests into the segment."""
+        # A forked child inherits owner=True, but its ParkingSystem is not the writer's
+        if not self._owner or os.getpid() != self._writer_pid:
+            raise SharedOccupancyError("Only the process that created the table may publish")
+        with self._publish_lock:
+            self._publish(requests)
+
+    def _publish(self, requests: Iterable[ParkingRequest]) -> None:
+        published = self._published_area_versions
+        changed = [
+            (index, area)
+            for index, area in enumerate(self._areas)
+            if published[index] != area.version
+        ]
+        if changed:
+            buf = self._buf
+            self._zones_seq += 1
+            _U64.pack_into(buf, _ZONES_SEQ_OFFSET, self._zones_seq)
+            for index, area in changed:
+                _AREA.pack_into(
+                    buf, self._areas_offset + index * _AREA.size,
+                    self._area_keys[index], self._area_zones[index], area.total_capacity(),
+                    area.version, area.available_count(), int(area.is_closed),
+                    *area.free_counts_by_features(),
+                )
+                self._published_area_versions[index] = area.version
+            self._zones_seq += 1
+            _U64.pack_into(buf, _ZONES_SEQ_OFFSET, self._zones_seq)
+
+        for request in requests:
+            self._publish_request(request)
+
+    def _publish_request(self, request: ParkingRequest) -> None:
+        request_id = _encode(request.request_id, 16)
+        vehicle_id = _encode(request.vehicle_id, 64)
+        preferred_zone_id = _encode(request.preferred_zone_id, 16)
+        slot_id = _encode(request.allocated_slot_id, 32)
+        slot = self._request_slots.get(request.request_id)
+        if slot is None and None not in (request_id, vehicle_id, preferred_zone_id):
+            slot = self._claim_slot(request.request_id)
+        if slot is None or slot_id is None:
+            self._dropped += 1
+            _U32.pack_into(self._buf, _DROPPED_OFFSET, self._dropped)
+            return
+
+        state_code = _STATE_CODES[request.state]
+        zone_index = self._zone_index.get(request.allocated_zone_id, -1)
+        area_index = self._area_index.get((request.allocated_zone_id, request.allocated_area_id), -1)
+
+        offset = self._requests_offset + slot * _REQUEST_STRIDE
+        seq = _U64.unpack_from(self._buf, offset)[0]
+        _U64.pack_into(self._buf, offset, seq + 1)
+        _REQUEST_BODY.pack_into(
+            self._buf, offset + 8,
+            request_id, vehicle_id, preferred_zone_id,
+            int(request.required_features), state_code,
+            zone_index, area_index, slot_id,
+            request.created_at_ns, request.updated_at_ns, request.version,
+        )
+        _U64.pack_into(self._buf, offset, seq + 2)
+
+        if state_code in _FINISHED_CODES:
+            self._finished[request.request_id] = None
+            self._finished.move_to_end(request.request_id)
+        else:
+            self._finished.pop(request.request_id, None)
+
+    def _claim_slot(self, request_id: str) -> Optional[int]:
+        # Evict above 3/4 load to keep probe chains short; only a table of live requests fills up
+        if len(self._request_slots) >= self._request_capacity * 3 // 4:
+            self._evict_finished()
+        if len(self._request_slots) >= self._request_capacity:
+            return None
+        slot = zlib.crc32(request_id.encode("utf-8")) % self._request_capacity
+        probe = 0
+        # Take the first never-used or evicted entry on the probe path.
+        while True:
+            first = self._buf[self._requests_offset + slot * _REQUEST_STRIDE + 8]
+            if first == 0 or first == _TOMBSTONE[0]:
+                break
+            slot = (slot + 1) % self._request_capacity
+            probe += 1
+        self._request_slots[request_id] = slot
+        if probe > self._max_probe:
+            self._max_probe = probe
+            _U32.pack_into(self._buf, _MAX_PROBE_OFFSET, probe)
+        return slot
+
+    def _evict_finished(self) -> None:
+        if not self._finished:
+            return
+        request_id, _ = self._finished.popitem(last=False)
+        offset = self._requests_offset + self._request_slots.pop(request_id) * _REQUEST_STRIDE
+        seq = _U64.unpack_from(self._buf, offset)[0]
+        _U64.pack_into(self._buf, offset, seq + 1)
+        self._buf[offset + 8:offset + 24] = _TOMBSTONE
+        _U64.pack_into(self._buf, offset, seq + 2)
+
+    # ---------- Readers ----------
+    def read_zones(self) -> Tuple[ZoneSnapshot, ...]:
+        buf = self._buf
+        for _ in range(_READ_RETRIES):
+            seq = _U64.unpack_from(buf, _ZONES_SEQ_OFFSET)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            rows = [
+                _AREA.unpack_from(buf, self._areas_offset + i * _AREA.size)
+                for i in range(len(self._area_ids))
+            ]
+            if _U64.unpack_from(buf, _ZONES_SEQ_OFFSET)[0] == seq:
+                break
+        else:
+            raise SharedOccupancyError("Occupancy table is busy, try again")
+
+        zones = []
+        for zone_id, name, first, count in self._zones:
+            areas = tuple(
+                AreaSnapshot(
+                    area_id=self._area_ids[i],
+                    total_slots=rows[i][2],
+                    available_slots=rows[i][4],
+                    is_closed=bool(rows[i][5]),
+                )
+                for i in range(first, first + count)
+            )
+            version = sum(rows[i][3] for i in range(first, first + count))
+            zones.append(ZoneSnapshot(zone_id=zone_id, zone_name=name, version=version, areas=areas))
+        return tuple(zones)
+
+    def availability(self, required: SlotFeature = SlotFeature.NONE) -> Dict[str, int]:
+        """Free slots per zone that satisfy ``required``, counting open areas only."""
+        buf = self._buf
+        masks = [mask for mask in range(_FEATURE_COMBINATIONS) if mask & required == required]
+        for _ in range(_READ_RETRIES):
+            seq = _U64.unpack_from(buf, _ZONES_SEQ_OFFSET)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            counts = {}
+            for zone_id, _, first, count in self._zones:
+                free = 0
+                for i in range(first, first + count):
+                    row = _AREA.unpack_from(buf, self._areas_offset + i * _AREA.size)
+                    if not row[5]:
+                        free += sum(row[6 + mask] for mask in masks)
+                counts[zone_id] = free
+            if _U64.unpack_from(buf, _ZONES_SEQ_OFFSET)[0] == seq:
+                return counts
+        raise SharedOccupancyError("Occupancy table is busy, try again")
+
+    def read_request(self, request_id: str) -> Optional[RequestSnapshot]:
+        key = _encode(request_id, 16)
+        if key is None:
+            return None
+        key = key.ljust(16, b"\0")
+        slot = zlib.crc32(request_id.encode("utf-8")) % self._request_capacity
+        # No request was ever placed further than max_probe from its home entry
+        max_probe = _U32.unpack_from(self._buf, _MAX_PROBE_OFFSET)[0]
+        for _ in range(max_probe + 1):
+            offset = self._requests_offset + slot * _REQUEST_STRIDE
+            found, row = self._read_entry(offset, key)
+            if found:
+                return self._to_snapshot(row)
+            if row is _EMPTY_ENTRY:
+                return None
+            slot = (slot + 1) % self._request_capacity
+        return None
+
+    def _read_entry(self, offset: int, key: bytes) -> Tuple[bool, object]:
+        """Read the entry at ``offset`` under its sequence word.
+
+        Returns (True, row) if it holds ``key``, (False, _EMPTY_ENTRY) if it was
+        never used, and (False, None) if it holds another or an evicted request.
+        The key is checked inside the same window as the row, so an entry
+        evicted and reclaimed mid-read is never reported under ``key``.
+        """
+        buf = self._buf
+        for _ in range(_READ_RETRIES):
+            seq = _U64.unpack_from(buf, offset)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            stored = bytes(buf[offset + 8:offset + 24])
+            row = _REQUEST_BODY.unpack_from(buf, offset + 8) if stored == key else None
+            if _U64.unpack_from(buf, offset)[0] != seq:
+                continue
+            if row is not None and row[0] == key:
+                return True, row
+            return False, (_EMPTY_ENTRY if stored[0] == 0 else None)
+        raise SharedOccupancyError("Occupancy table is busy, try again")
+
+    def _to_snapshot(self, row: tuple) -> RequestSnapshot:
+        (request_id, vehicle_id, preferred_zone_id, required, state_code,
+         zone_index, area_index, slot_id, created_ns, updated_ns, version) = row
+        return RequestSnapshot(
+            request_id=_decode(request_id),
+            vehicle_id=_decode(vehicle_id),
+            preferred_zone_id=_decode(preferred_zone_id),
+            required_features=SlotFeature(required),
+            state=_STATES[state_code],
+            allocated_zone_id=self._zones[zone_index][0] if zone_index >= 0 else None,
+            allocated_area_id=self._area_ids[area_index] if area_index >= 0 else None,
+            allocated_slot_id=_decode(slot_id) or None,
+            created_at=_ns_to_datetime(created_ns),
+            updated_at=_ns_to_datetime(updated_ns),
+            version=version,
+        )
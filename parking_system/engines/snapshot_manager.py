@@ -0,0 +1,233 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+import threading
+import time
+
+from domain.zone import Zone
+from .allocation_engine import AllocationEngine
+from .analytics_engine import AnalyticsEngine
+
+
+RECENT_OPERATIONS_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class AreaSnapshot:
+    area_id: str
+    total_slots: int
+    available_slots: int
+    is_closed: bool
+
+    @property
+    def occupied_slots(self) -> int:
+        return self.total_slots - self.available_slots
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "area_id": self.area_id,
+            "total_slots": self.total_slots,
+            "occupied_slots": self.occupied_slots,
+            "available_slots": self.available_slots,
+            "is_closed": self.is_closed,
+        }
+
+
+@dataclass(frozen=True)
+class ZoneSnapshot:
+    zone_id: str
+    zone_name: str
+    version: int
+    areas: Tuple[AreaSnapshot, ...]
+
+    @property
+    def total_slots(self) -> int:
+        return sum(area.total_slots for area in self.areas)
+
+    @property
+    def available_slots(self) -> int:
+        return sum(area.available_slots for area in self.areas)
+
+    @property
+    def occupied_slots(self) -> int:
+        return self.total_slots - self.available_slots
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "zone_id": self.zone_id,
+            "zone_name": self.zone_name,
+            "total_slots": self.total_slots,
+            "occupied_slots": self.occupied_slots,
+            "available_slots": self.available_slots,
+            "areas": [area.to_dict() for area in self.areas],
+        }
+
+
+@dataclass(frozen=True)
+class OperationSnapshot:
+    operation_id: str
+    operation_type: str
+    description: str
+    timestamp: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.operation_id,
+            "type": self.operation_type,
+            "description": self.description,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    version: int
+    taken_at: datetime
+    zones: Tuple[ZoneSnapshot, ...]
+    recent_operations: Tuple[OperationSnapshot, ...]
+
+    @property
+    def zones_version(self) -> int:
+        return sum(zone.version for zone in self.zones)
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    version: int
+    taken_at: datetime
+    values: Mapping[str, Any]
+
+
+class SnapshotManager:
+    """Publishes immutable, versioned read views of the parking system.
+
+    Snapshots are only built on the writer side, under ``write_lock``, so
+    each one shows the domain objects between two commits. A commit publishes
+    straight away if ``max_staleness`` seconds have passed since the last
+    snapshot; otherwise a timer publishes once the window ends. Readers only
+    return the published snapshot. Snapshots cost O(areas); the analytics
+    metrics scan the request history, so they are published separately and
+    only rebuilt when a reader asks for them.
+    """
+
+    def __init__(
+        self,
+        zones: Dict[str, Zone],
+        allocation_engine: AllocationEngine,
+        analytics_engine: AnalyticsEngine,
+        max_staleness: float = 1.0,
+        write_lock: Optional[threading.Lock] = None,
+    ):
+        if max_staleness < 0:
+            raise ValueError("max_staleness must be non-negative")
+
+        self._zones = zones
+        self._allocation_engine = allocation_engine
+        self._analytics_engine = analytics_engine
+        self._max_staleness = max_staleness
+        self._write_lock = write_lock if write_lock is not None else threading.Lock()
+
+        self._commit_version: int = 0
+        self._published_at: float = time.monotonic()
+        self._current: SystemSnapshot = self._build(self._commit_version)
+        self._pending: Optional[threading.Timer] = None
+
+        self._metrics_published_at: float = 0.0
+        self._metrics_lock = threading.Lock()
+        self._metrics: Optional[MetricsSnapshot] = None
+
+    # ---------- Writers ----------
+    def commit(self) -> None:
+        """Record a change; callers hold ``write_lock``."""
+        self._commit_version += 1
+        wait = self._published_at + self._max_staleness - time.monotonic()
+        if wait <= 0:
+            self._publish()
+        elif self._pending is None:
+            self._pending = threading.Timer(wait, self._publish_pending)
+            self._pending.daemon = True
+            self._pending.start()
+
+    # ---------- Readers ----------
+    def latest(self) -> SystemSnapshot:
+        return self._current
+
+    def latest_metrics(self) -> MetricsSnapshot:
+        metrics = self._metrics
+        if metrics is not None:
+            if metrics.version == self._commit_version:
+                return metrics
+            if time.monotonic() - self._metrics_published_at < self._max_staleness:
+                return metrics
+            if not self._metrics_lock.acquire(blocking=False):
+                return metrics
+        else:
+            self._metrics_lock.acquire()
+        try:
+            self._metrics = self._build_metrics(self._commit_version)
+            self._metrics_published_at = time.monotonic()
+        finally:
+            self._metrics_lock.release()
+        return self._metrics
+
+    # ---------- Publishing ----------
+    def _publish(self) -> None:
+        self._current = self._build(self._commit_version)
+        self._published_at = time.monotonic()
+
+    def _publish_pending(self) -> None:
+        # Timer thread: publish the commits made since the window opened
+        with self._write_lock:
+            self._pending = None
+            if self._current.version != self._commit_version:
+                self._publish()
+
+    def _build(self, version: int) -> SystemSnapshot:
+        zones = tuple(
+            ZoneSnapshot(
+                zone_id=zone.zone_id,
+                zone_name=zone.name,
+                version=zone.version,
+                areas=tuple(
+                    AreaSnapshot(
+                        area_id=area.area_id,
+                        total_slots=area.total_capacity(),
+                        available_slots=area.available_count(),
+                        is_closed=area.is_closed,
+                    )
+                    for area in zone.areas
+                ),
+            )
+            for zone in list(self._zones.values())
+        )
+
+        recent_operations = tuple(
+            OperationSnapshot(
+                operation_id=op.operation_id,
+                operation_type=op.operation_type,
+                description=op.describe(),
+                timestamp=op.timestamp,
+            )
+            for op in self._allocation_engine._operations[-RECENT_OPERATIONS_LIMIT:]
+        )
+
+        return SystemSnapshot(
+            version=version,
+            taken_at=datetime.now(timezone.utc),
+            zones=zones,
+            recent_operations=recent_operations,
+        )
+
+    def _build_metrics(self, version: int) -> MetricsSnapshot:
+        analytics = self._analytics_engine
+        return MetricsSnapshot(
+            version=version,
+            taken_at=datetime.now(timezone.utc),
+            values=MappingProxyType({
+                "average_parking_duration": analytics.average_parking_duration(),
+                "zone_utilization": analytics.zone_utilization(),
+                "completed_vs_cancelled": analytics.completed_vs_cancelled_ratio(),
+                "peak_zones": analytics.peak_zones(),
+            }),
+        )
@@ -0,0 +1,56 @@
+"""Stream requests or operations from a running parking system to a file.
+
+    python export_cli.py requests --format csv --gzip -o requests.csv.gz
+    python export_cli.py operations --since 2024-01-15T00:00:00+00:00 -o ops.ndjson
+"""
+import argparse
+import shutil
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+CHUNK_BYTES = 64 * 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=["requests", "operations"])
+    parser.add_argument("--url", default="http://localhost:5000", help="base URL of the parking system")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress the export")
+    parser.add_argument("--state", help="request state filter (requests only)")
+    parser.add_argument("--type", dest="operation_type", help="operation type filter (operations only)")
+    parser.add_argument("--since", dest="created_after", help="ISO-8601 lower time bound")
+    parser.add_argument("--until", dest="created_before", help="ISO-8601 upper time bound")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    params = {"format": args.format}
+    if args.gzip:
+        params["gzip"] = "true"
+    for name in ("state", "operation_type", "created_after", "created_before"):
+        value = getattr(args, name)
+        if value:
+            params[name] = value
+
+    url = f"{args.url.rstrip('/')}/api/admin/export/{args.kind}?{urllib.parse.urlencode(params)}"
+    try:
+        with urllib.request.urlopen(url) as response:
+            if args.output:
+                with open(args.output, "wb") as out:
+                    shutil.copyfileobj(response, out, CHUNK_BYTES)
+            else:
+                shutil.copyfileobj(response, sys.stdout.buffer, CHUNK_BYTES)
+    except urllib.error.HTTPError as e:
+        print(f"export failed: HTTP {e.code}: {e.read().decode(errors='replace')}", file=sys.stderr)
+        return 1
+    except urllib.error.URLError as e:
+        print(f"export failed: {e.reason}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+from domain.parking_slot import SlotFeature
+from .parking_system import ParkingSystem, ParkingSystemError
+
+
+class _PendingSubmit:
+    __slots__ = ("item", "done", "result")
+
+    def __init__(self, item: Tuple[str, str, SlotFeature]) -> None:
+        self.item = item
+        self.done = threading.Event()
+        self.result: Union[str, ParkingSystemError, None] = None
+
+
+class MicroBatcher:
+    """Collects concurrent submits for a short window and allocates them together.
+
+    The first submit of a window wakes the flusher thread, which waits
+    ``window_seconds`` (or until ``max_batch`` submits are queued) and hands
+    the whole window to ``ParkingSystem.submit_batch``. Callers block until
+    their batch is solved, so each submit pays up to one window of latency.
+    """
+
+    def __init__(self, system: ParkingSystem, window_seconds: float, max_batch: int = 1000) -> None:
+        if window_seconds <= 0 or max_batch <= 0:
+            raise ValueError("window_seconds and max_batch must be positive")
+
+        self._system = system
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._pending: List[_PendingSubmit] = []
+        self._cond = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        vehicle_id: str,
+        preferred_zone_id: str,
+        required_features: SlotFeature = SlotFeature.NONE,
+    ) -> str:
+        pending = _PendingSubmit((vehicle_id, preferred_zone_id, required_features))
+        with self._cond:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._flusher.start()
+            self._pending.append(pending)
+            self._cond.notify()
+        pending.done.wait()
+
+        if isinstance(pending.result, ParkingSystemError):
+            raise pending.result
+        return pending.result
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.monotonic() + self._window
+                while len(self._pending) < self._max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self._max_batch]
+                del self._pending[:self._max_batch]
+            self._flush(batch)
+
+    def _flush(self, batch: List[_PendingSubmit]) -> None:
+        try:
+            results = self._system.submit_batch([pending.item for pending in batch])
+        except Exception as e:
+            # submit_batch reports allocation failures per item, so nothing was allocated here
+            results = [ParkingSystemError(f"Batch allocation failed: {str(e)}")] * len(batch)
+        for pending, result in zip(batch, results):
+            pending.result = result
+            pending.done.set()
@@ -1,70 +1,295 @@
+import os
+import threading
+import time
 import uuid
 import hashlib
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from engines.allocation_engine import AllocationEngine, AllocationError
+from engines.batch_allocator import BatchAllocator
 from engines.rollback_manager import RollbackManager
 from engines.analytics_engine import AnalyticsEngine
+from engines.snapshot_manager import MetricsSnapshot, SnapshotManager, SystemSnapshot
+from engines.request_index import RequestIndex, RequestIndexError
+from engines.shared_occupancy import SharedOccupancyTable
+from engines import exporter
 from domain.zone import Zone
 from domain.parking_request import ParkingRequest, ParkingRequestState
+from domain.parking_slot import SlotFeature
 
 
 class ParkingSystemError(Exception):
     pass
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Read a naive time bound as UTC, the zone every stored timestamp uses."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
 class ParkingSystem:
-    def __init__(self, zones: Dict[str, Zone]):
+    def __init__(
+        self,
+        zones: Dict[str, Zone],
+        snapshot_max_staleness: float = 1.0,
+        occupancy_table: Optional[SharedOccupancyTable] = None,
+    ):
         self.zones = zones
         self.requests_registry: Dict[str, ParkingRequest] = {}
+        self.request_index = RequestIndex()
         self.allocation_engine = AllocationEngine(zones)
+        self.batch_allocator = BatchAllocator(self.allocation_engine)
         self.rollback_manager = RollbackManager(self.allocation_engine, self.requests_registry)
         self.analytics_engine = AnalyticsEngine(zones)
+        # Serializes every mutation, including its publish, across request and batcher threads
+        self._write_lock = threading.Lock()
+        self.snapshot_manager = SnapshotManager(
+            zones, self.allocation_engine, self.analytics_engine, snapshot_max_staleness,
+            write_lock=self._write_lock,
+        )
+        # Shared-memory copy of occupancy for reader processes; this process is its only writer
+        self.occupancy_table = occupancy_table
         self._request_counter = 0
+        self._created_ns = time.time_ns()
 
     def _generate_request_id(self, vehicle_id: str, zone_id: str) -> str:
         """Generate a short 6-character request ID with zone and vehicle info"""
-        self._request_counter += 1
-        # Create hash from vehicle_id, zone_id, and counter
-        combo = f"{zone_id}{vehicle_id}{self._request_counter}"
-        hash_obj = hashlib.md5(combo.encode())
-        hash_hex = hash_obj.hexdigest()
         # Get first char from zone, first 2 from vehicle, and 3 from hash = 6 chars
         zone_char = zone_id[0].upper() if zone_id else 'Z'
         vehicle_chars = vehicle_id[:2].upper() if vehicle_id else 'VH'
-        hash_chars = hash_hex[:3].upper()
-        return f"{zone_char}{vehicle_chars}{hash_chars}"
+        hash_width = 3
+        while True:
+            self._request_counter += 1
+            # Create hash from vehicle_id, zone_id, and counter
+            combo = f"{zone_id}{vehicle_id}{self._request_counter}"
+            hash_hex = hashlib.md5(combo.encode()).hexdigest()
+            request_id = f"{zone_char}{vehicle_chars}{hash_hex[:hash_width].upper()}"
+            if request_id not in self.requests_registry:
+                return request_id
+            # Collision: widen the hash part until the ID is unique
+            hash_width = min(hash_width + 1, len(hash_hex))
+
+    @property
+    def epoch(self) -> str:
+        """Identifies this system in this process, for ETags.
+
+        Versions and request IDs restart in every process, and forked workers
+        diverge from the system they inherit, so an ETag must name both.
+        """
+        return f"{self._created_ns:x}.{os.getpid()}"
 
     # ---------- Submit Request ----------
-    def submit_request(self, vehicle_id: str, preferred_zone_id: str) -> str:
-        request_id = self._generate_request_id(vehicle_id, preferred_zone_id)
-        req = ParkingRequest(request_id, vehicle_id, preferred_zone_id)
-        req.transition_to(ParkingRequestState.VALIDATED)
-        self.requests_registry[request_id] = req
+    def submit_request(
+        self,
+        vehicle_id: str,
+        preferred_zone_id: str,
+        required_features: SlotFeature = SlotFeature.NONE,
+    ) -> str:
+        with self._write_lock:
+            request_id = self._generate_request_id(vehicle_id, preferred_zone_id)
+            req = ParkingRequest(request_id, vehicle_id, preferred_zone_id, required_features)
+            req.transition_to(ParkingRequestState.VALIDATED)
+            self.request_index.add(req)
+            self.requests_registry[request_id] = req
 
-        try:
-            self.allocation_engine.allocate(req)
-            self.analytics_engine.record_request(req)
-        except AllocationError as e:
-            self.analytics_engine.record_request(req)
-            raise ParkingSystemError(f"Allocation failed: {str(e)}") from e
+            try:
+                self.allocation_engine.allocate(req)
+                self.analytics_engine.record_request(req)
+            except AllocationError as e:
+                self.analytics_engine.record_request(req)
+                raise ParkingSystemError(f"Allocation failed: {str(e)}") from e
+            finally:
+                self._commit([req])
+
+            return request_id
+
+    def submit_batch(
+        self, items: List[Tuple[str, str, SlotFeature]]
+    ) -> List[Union[str, ParkingSystemError]]:
+        """Submit (vehicle_id, preferred_zone_id, required_features) items as one batch.
 
-        return request_id
+        Slots are assigned jointly across the batch. Returns the request ID or
+        the ParkingSystemError for each item, in order.
+        """
+        with self._write_lock:
+            reqs = []
+            for vehicle_id, preferred_zone_id, required_features in items:
+                request_id = self._generate_request_id(vehicle_id, preferred_zone_id)
+                req = ParkingRequest(request_id, vehicle_id, preferred_zone_id, required_features)
+                req.transition_to(ParkingRequestState.VALIDATED)
+                self.request_index.add(req)
+                self.requests_registry[request_id] = req
+                reqs.append(req)
+
+            try:
+                errors = self.batch_allocator.allocate_batch(reqs)
+            except Exception as e:
+                # allocate_batch leaves no request ALLOCATING; report by final state
+                errors = [
+                    AllocationError(str(e)) if req.state != ParkingRequestState.ALLOCATED else None
+                    for req in reqs
+                ]
+            finally:
+                self._commit(reqs)
+
+            results: List[Union[str, ParkingSystemError]] = []
+            for req, error in zip(reqs, errors):
+                self.analytics_engine.record_request(req)
+                if error is None:
+                    results.append(req.request_id)
+                else:
+                    results.append(ParkingSystemError(f"Allocation failed: {str(error)}"))
+            return results
+
+    def free_capacity(self) -> int:
+        return self.allocation_engine.free_capacity()
+
+    def availability(self, required_features: SlotFeature = SlotFeature.NONE) -> Dict[str, int]:
+        """Free slots per zone that satisfy ``required_features``, counting open areas only."""
+        return {
+            zone.zone_id: sum(
+                area.available_count_for(required_features)
+                for area in zone.areas
+                if not area.is_closed
+            )
+            for zone in self.zones.values()
+        }
 
     # ---------- Release Request ----------
     def release_request(self, request_id: str) -> None:
-        req = self.requests_registry.get(request_id)
-        if not req:
-            raise ParkingSystemError(f"Request {request_id} not found")
+        with self._write_lock:
+            req = self.requests_registry.get(request_id)
+            if not req:
+                raise ParkingSystemError(f"Request {request_id} not found")
+
+            try:
+                self.allocation_engine.release(req)
+                self.analytics_engine.record_request(req)
+            except AllocationError as e:
+                raise ParkingSystemError(f"Release failed: {str(e)}") from e
+            finally:
+                self._commit([req])
 
+    # ---------- Listing ----------
+    def list_requests(
+        self,
+        state: Optional[ParkingRequestState] = None,
+        zone_id: Optional[str] = None,
+        vehicle_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[ParkingRequest], Optional[str]]:
         try:
-            self.allocation_engine.release(req)
-            self.analytics_engine.record_request(req)
-        except AllocationError as e:
-            raise ParkingSystemError(f"Release failed: {str(e)}") from e
+            return self.request_index.query(
+                state=state,
+                zone_id=zone_id,
+                vehicle_id=vehicle_id,
+                created_after=_as_utc(created_after),
+                created_before=_as_utc(created_before),
+                cursor=cursor,
+                limit=limit,
+            )
+        except RequestIndexError as e:
+            raise ParkingSystemError(str(e)) from e
+
+    # ---------- Export ----------
+    def export_requests(
+        self,
+        fmt: str = "ndjson",
+        compress: bool = False,
+        state: Optional[ParkingRequestState] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Iterator[bytes]:
+        requests = self.request_index.iter_range(
+            state, _as_utc(created_after), _as_utc(created_before)
+        )
+        records = (exporter.request_record(req) for req in requests)
+        try:
+            return exporter.encode(records, exporter.REQUEST_FIELDS, fmt, compress)
+        except exporter.ExportError as e:
+            raise ParkingSystemError(str(e)) from e
+
+    def export_operations(
+        self,
+        fmt: str = "ndjson",
+        compress: bool = False,
+        operation_type: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Iterator[bytes]:
+        operations = exporter.iter_operations(
+            self.allocation_engine._operations,
+            _as_utc(created_after),
+            _as_utc(created_before),
+            operation_type,
+        )
+        records = (exporter.operation_record(op) for op in operations)
+        try:
+            return exporter.encode(records, exporter.OPERATION_FIELDS, fmt, compress)
+        except exporter.ExportError as e:
+            raise ParkingSystemError(str(e)) from e
 
     # ---------- Rollback ----------
     def rollback_last_k_operations(self, k: int) -> None:
-        self.rollback_manager.rollback(k)
+        with self._write_lock:
+            ops = self.allocation_engine._operations[-k:] if k > 0 else []
+            try:
+                self.rollback_manager.rollback(k)
+            finally:
+                self._commit(self._requests_of(ops))
+
+    # ---------- Maintenance ----------
+    def close_area(self, zone_id: str, area_id: Optional[str] = None) -> str:
+        return self._run_maintenance(self.allocation_engine.close_area, zone_id, area_id)
+
+    def drain_area(self, zone_id: str, area_id: Optional[str] = None) -> str:
+        return self._run_maintenance(self.allocation_engine.drain_area, zone_id, area_id)
+
+    def reopen_area(self, zone_id: str, area_id: Optional[str] = None) -> str:
+        return self._run_maintenance(self.allocation_engine.reopen_area, zone_id, area_id)
+
+    def _run_maintenance(self, action, zone_id: str, area_id: Optional[str]) -> str:
+        with self._write_lock:
+            op = None
+            try:
+                op = action(zone_id, area_id)
+            except AllocationError as e:
+                raise ParkingSystemError(f"Maintenance failed: {str(e)}") from e
+            finally:
+                self._commit(self._requests_of([op] if op is not None else []))
+            return op.describe()
+
+    # ---------- Publishing ----------
+    def _commit(self, touched: Iterable[ParkingRequest] = ()) -> None:
+        """Publish a change to the snapshot manager and, if attached, the shared table.
+
+        Callers hold _write_lock, so the shared table only ever sees one
+        writer thread.
+        """
+        self.snapshot_manager.commit()
+        if self.occupancy_table is not None:
+            self.occupancy_table.publish(touched)
+
+    def _requests_of(self, ops) -> List[ParkingRequest]:
+        request_ids = set()
+        for op in ops:
+            if op.request_id:
+                request_ids.add(op.request_id)
+            request_ids.update(move.request_id for move in getattr(op, "moves", ()))
+        registry = self.requests_registry
+        return [registry[rid] for rid in request_ids if rid in registry]
+
+    # ---------- Read Snapshots ----------
+    def get_snapshot(self) -> SystemSnapshot:
+        return self.snapshot_manager.latest()
+
+    def get_metrics_snapshot(self) -> MetricsSnapshot:
+        return self.snapshot_manager.latest_metrics()
 
     # ---------- Analytics ----------
     def get_metrics(self) -> Dict[str, Any]:
@@ -0,0 +1,92 @@
+"""Replay a recorded or synthetic trace against each allocation policy.
+
+Run from the parking_system directory:
+
+    python -m simulation --rate 2000 --hours 24 --zones 5 --areas 4 --slots 100
+    python -m simulation --trace arrivals.csv --zones 5 --areas 4 --slots 100
+    python -m simulation --spike 18:20:5:Z1 --batch-window 0.2
+"""
+import argparse
+import json
+
+from .simulator import DEFAULT_POLICIES, build_uniform_zones, compare_policies
+from .traces import COMMUTER_PROFILE, EventSpike, poisson_arrivals, read_trace, write_trace
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m simulation", description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="CSV trace to replay instead of a synthetic one")
+    parser.add_argument("--write-trace", help="write the synthetic trace to this CSV and exit")
+    parser.add_argument("--zones", type=int, default=5)
+    parser.add_argument("--areas", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=2000.0, help="mean arrivals per hour")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--dwell", type=float, default=2.0, help="mean dwell time in hours")
+    parser.add_argument("--flat", action="store_true", help="disable the commuter time-of-day profile")
+    parser.add_argument(
+        "--spike", action="append", default=[], metavar="START_H:END_H:MULT[:ZONE]",
+        help="add an event spike, e.g. 18:20:5:Z1",
+    )
+    parser.add_argument(
+        "--batch-window", type=float, default=0.0, metavar="SECONDS",
+        help="also run a 'batch' policy that allocates arrivals in windows of this length",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON lines")
+    args = parser.parse_args()
+
+    zone_ids = [f"Z{z}" for z in range(1, args.zones + 1)]
+
+    def synthetic():
+        spikes = []
+        for spec in args.spike:
+            parts = spec.split(":")
+            spikes.append(EventSpike(
+                start=float(parts[0]) * 3600,
+                end=float(parts[1]) * 3600,
+                multiplier=float(parts[2]),
+                zone_id=parts[3] if len(parts) > 3 else None,
+            ))
+        return poisson_arrivals(
+            rate_per_hour=args.rate,
+            duration_hours=args.hours,
+            zone_weights={zone_id: 1.0 for zone_id in zone_ids},
+            mean_dwell_hours=args.dwell,
+            profile=None if args.flat else COMMUTER_PROFILE,
+            spikes=spikes,
+            seed=args.seed,
+        )
+
+    if args.write_trace:
+        count = write_trace(args.write_trace, synthetic())
+        print(f"wrote {count} arrivals to {args.write_trace}")
+        return
+
+    trace_factory = (lambda: read_trace(args.trace)) if args.trace else synthetic
+    policies = dict(DEFAULT_POLICIES)
+    batch_windows = {}
+    if args.batch_window > 0:
+        policies["batch"] = DEFAULT_POLICIES["greedy"]
+        batch_windows["batch"] = args.batch_window
+    reports = compare_policies(
+        trace_factory,
+        lambda: build_uniform_zones(args.zones, args.areas, args.slots),
+        policies=policies,
+        batch_windows=batch_windows,
+    )
+    for report in reports:
+        data = report.to_dict()
+        if args.json:
+            print(json.dumps(data))
+            continue
+        print(
+            f"{data['policy']:<10} arrivals={data['arrivals']:<8} "
+            f"fallback={data['fallback_rate']:6.2%} failure={data['failure_rate']:6.2%} "
+            f"util={data['utilization']:6.2%} p50={data['latency_p50_us']:7.1f}us "
+            f"p99={data['latency_p99_us']:7.1f}us events/s={data['events_per_second']:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import heapq
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain.parking_area import ParkingArea
+from domain.parking_slot import ParkingSlot
+from domain.zone import Zone
+from orchestrator.parking_system import ParkingSystem, ParkingSystemError
+from .traces import Arrival
+
+
+# A policy builds the system under test from a fresh topology.
+PolicyFactory = Callable[[Dict[str, Zone]], ParkingSystem]
+
+DEFAULT_POLICIES: Dict[str, PolicyFactory] = {
+    "greedy": lambda zones: ParkingSystem(zones),
+}
+
+
+def build_uniform_zones(n_zones: int, n_areas: int, n_slots: int) -> Dict[str, Zone]:
+    zones = {}
+    for z in range(1, n_zones + 1):
+        zone_id = f"Z{z}"
+        areas = []
+        for a in range(1, n_areas + 1):
+            area_id = f"{zone_id}A{a}"
+            areas.append(ParkingArea(area_id, zone_id, [ParkingSlot(f"S{s}", area_id) for s in range(1, n_slots + 1)]))
+        zones[zone_id] = Zone(zone_id, f"Zone {z}", areas)
+    return zones
+
+
+class SimulationReport:
+    def __init__(
+        self,
+        policy: str,
+        arrivals: int,
+        allocated: int,
+        fallbacks: int,
+        failures: int,
+        departures: int,
+        utilization: float,
+        latencies_ns: array,
+        virtual_seconds: float,
+        wall_seconds: float,
+    ):
+        self.policy = policy
+        self.arrivals = arrivals
+        self.allocated = allocated
+        self.fallbacks = fallbacks
+        self.failures = failures
+        self.departures = departures
+        self.utilization = utilization
+        self.virtual_seconds = virtual_seconds
+        self.wall_seconds = wall_seconds
+        self._latencies = sorted(latencies_ns)
+
+    @property
+    def events(self) -> int:
+        return self.arrivals + self.departures
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.fallbacks / self.allocated if self.allocated else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.arrivals if self.arrivals else 0.0
+
+    def latency_percentile_us(self, pct: float) -> float:
+        if not self._latencies:
+            return 0.0
+        idx = min(len(self._latencies) - 1, int(len(self._latencies) * pct / 100))
+        return self._latencies[idx] / 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "arrivals": self.arrivals,
+            "departures": self.departures,
+            "allocated": self.allocated,
+            "fallback_rate": self.fallback_rate,
+            "failure_rate": self.failure_rate,
+            "utilization": self.utilization,
+            "latency_p50_us": self.latency_percentile_us(50),
+            "latency_p99_us": self.latency_percentile_us(99),
+            "virtual_hours": self.virtual_seconds / 3600,
+            "events_per_second": self.events / self.wall_seconds if self.wall_seconds else 0.0,
+        }
+
+
+class Simulator:
+    """Replays an arrival trace against a ParkingSystem in virtual time.
+
+    Arrivals are consumed lazily from the trace; departures are scheduled on
+    a heap when an allocation succeeds. Only the submit call is timed for the
+    latency figures, so trace generation does not skew them.
+
+    With ``batch_window`` > 0, arrivals are held for that many virtual seconds
+    and submitted together through ``ParkingSystem.submit_batch``; every
+    request in a batch is charged the latency of the whole batch call.
+    """
+
+    def __init__(self, system: ParkingSystem, policy: str = "greedy", batch_window: float = 0.0):
+        self._system = system
+        self._policy = policy
+        self._batch_window = batch_window
+        self._capacity = sum(zone.total_capacity() for zone in system.zones.values())
+
+    def run(self, arrivals: Iterable[Arrival], until: Optional[float] = None) -> SimulationReport:
+        system = self._system
+        registry = system.requests_registry
+        departures: List[Tuple[float, str]] = []
+        pending: List[Arrival] = []
+        flush_at = 0.0
+        latencies = array("q")
+
+        n_arrivals = n_allocated = n_fallbacks = n_failures = n_departures = 0
+        occupied = 0
+        occupied_area = 0.0  # integral of occupied slots over virtual time
+        clock = 0.0
+
+        def advance(to: float) -> None:
+            # Drain departures due by ``to``, then move the clock there.
+            nonlocal occupied, occupied_area, clock, n_departures
+            while departures and departures[0][0] <= to:
+                at, request_id = heapq.heappop(departures)
+                occupied_area += occupied * (at - clock)
+                clock = at
+                system.release_request(request_id)
+                occupied -= 1
+                n_departures += 1
+            occupied_area += occupied * (to - clock)
+            clock = to
+
+        def record(arrival: Arrival, request_id: Optional[str]) -> None:
+            nonlocal occupied, n_allocated, n_fallbacks, n_failures
+            if request_id is None:
+                n_failures += 1
+                return
+            n_allocated += 1
+            occupied += 1
+            if registry[request_id].allocated_zone_id != arrival.zone_id:
+                n_fallbacks += 1
+            heapq.heappush(departures, (clock + arrival.duration, request_id))
+
+        def flush() -> None:
+            advance(flush_at)
+            started = time.perf_counter_ns()
+            results = system.submit_batch(
+                [(a.vehicle_id, a.zone_id, a.required_features) for a in pending]
+            )
+            elapsed = time.perf_counter_ns() - started
+            for arrival, result in zip(pending, results):
+                latencies.append(elapsed)
+                record(arrival, None if isinstance(result, ParkingSystemError) else result)
+            pending.clear()
+
+        wall_start = time.perf_counter()
+        for arrival in arrivals:
+            if until is not None and arrival.time > until:
+                break
+            if pending and arrival.time >= flush_at:
+                flush()
+
+            advance(arrival.time)
+            n_arrivals += 1
+
+            if self._batch_window > 0:
+                if not pending:
+                    flush_at = arrival.time + self._batch_window
+                pending.append(arrival)
+                continue
+
+            started = time.perf_counter_ns()
+            try:
+                request_id = system.submit_request(
+                    arrival.vehicle_id, arrival.zone_id, arrival.required_features
+                )
+            except ParkingSystemError:
+                request_id = None
+            latencies.append(time.perf_counter_ns() - started)
+            record(arrival, request_id)
+
+        if pending:
+            flush()
+
+        # departures is a heap, so the last departure is its maximum, not its last element
+        end = until if until is not None else max((at for at, _ in departures), default=clock)
+        end = max(end, clock)
+        advance(end)
+
+        wall_seconds = time.perf_counter() - wall_start
+        utilization = occupied_area / (self._capacity * end) if self._capacity and end > 0 else 0.0
+        return SimulationReport(
+            policy=self._policy,
+            arrivals=n_arrivals,
+            allocated=n_allocated,
+            fallbacks=n_fallbacks,
+            failures=n_failures,
+            departures=n_departures,
+            utilization=utilization,
+            latencies_ns=latencies,
+            virtual_seconds=end,
+            wall_seconds=wall_seconds,
+        )
+
+
+def compare_policies(
+    trace_factory: Callable[[], Iterable[Arrival]],
+    zones_factory: Callable[[], Dict[str, Zone]],
+    policies: Optional[Dict[str, PolicyFactory]] = None,
+    until: Optional[float] = None,
+    batch_windows: Optional[Dict[str, float]] = None,
+) -> List[SimulationReport]:
+    """Run the same trace against each policy on its own fresh topology.
+
+    ``batch_windows`` maps policy names to a batch window in virtual seconds.
+    """
+    reports = []
+    batch_windows = batch_windows or {}
+    for name, factory in (policies or DEFAULT_POLICIES).items():
+        system = factory(zones_factory())
+        simulator = Simulator(system, name, batch_window=batch_windows.get(name, 0.0))
+        reports.append(simulator.run(trace_factory(), until=until))
+    return reports
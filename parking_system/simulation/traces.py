@@ -0,0 +1,157 @@
+import csv
+import itertools
+import math
+import random
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from domain.parking_slot import SlotFeature
+
+
+SECONDS_PER_HOUR = 3600.0
+
+
+class TraceError(Exception):
+    pass
+
+
+class Arrival(NamedTuple):
+    time: float  # virtual seconds since trace start
+    vehicle_id: str
+    zone_id: str
+    duration: float  # seconds parked once allocated
+    required_features: SlotFeature = SlotFeature.NONE
+
+
+class EventSpike(NamedTuple):
+    start: float
+    end: float
+    multiplier: float
+    zone_id: Optional[str] = None  # None spreads the spike over all zones
+
+
+# Relative arrival intensity per hour of day: quiet night, morning and evening peaks.
+COMMUTER_PROFILE: Sequence[float] = (
+    0.1, 0.05, 0.05, 0.05, 0.1, 0.3, 0.8, 1.6, 2.0, 1.4, 1.0, 1.0,
+    1.1, 1.0, 0.9, 1.0, 1.4, 1.8, 1.5, 1.0, 0.7, 0.5, 0.3, 0.2,
+)
+
+
+# ---------- Synthetic Traces ----------
+def poisson_arrivals(
+    rate_per_hour: float,
+    duration_hours: float,
+    zone_weights: Dict[str, float],
+    mean_dwell_hours: float = 2.0,
+    profile: Optional[Sequence[float]] = None,
+    spikes: Iterable[EventSpike] = (),
+    feature_mix: Optional[Dict[SlotFeature, float]] = None,
+    seed: Optional[int] = None,
+) -> Iterator[Arrival]:
+    """Yield arrivals from a non-homogeneous Poisson process, in time order.
+
+    The rate is ``rate_per_hour`` scaled by the hour-of-day ``profile`` and
+    any active ``spikes``. It is piecewise constant, so each segment is
+    sampled directly (the process is memoryless at segment boundaries) and
+    the trace is generated lazily in constant memory.
+    """
+    if rate_per_hour <= 0 or duration_hours <= 0:
+        raise TraceError("rate_per_hour and duration_hours must be positive")
+    if not zone_weights:
+        raise TraceError("zone_weights must name at least one zone")
+
+    rng = random.Random(seed)
+    spikes = sorted(spikes, key=lambda s: s.start)
+    profile = list(profile) if profile else [1.0] * 24
+    if len(profile) != 24:
+        raise TraceError("profile must have 24 hourly multipliers")
+
+    zone_ids = list(zone_weights)
+    cum_zone_weights = list(itertools.accumulate(zone_weights[z] for z in zone_ids))
+    features = list(feature_mix) if feature_mix else []
+    cum_feature_weights = list(itertools.accumulate(feature_mix[f] for f in features)) if features else []
+
+    boundaries = {s.start for s in spikes} | {s.end for s in spikes}
+    horizon = duration_hours * SECONDS_PER_HOUR
+    mean_dwell = mean_dwell_hours * SECONDS_PER_HOUR
+    base_rate = rate_per_hour / SECONDS_PER_HOUR
+
+    t = 0.0
+    vehicle_seq = 0
+    while t < horizon:
+        # Current constant-rate segment: up to the next hour or spike boundary
+        segment_end = min(
+            [horizon, (t // SECONDS_PER_HOUR + 1) * SECONDS_PER_HOUR]
+            + [b for b in boundaries if b > t]
+        )
+        spike = next((s for s in spikes if s.start <= t < s.end), None)
+        rate = base_rate * profile[int(t // SECONDS_PER_HOUR) % 24]
+        if spike:
+            rate *= spike.multiplier
+        if rate <= 0:
+            t = segment_end
+            continue
+
+        while True:
+            t += rng.expovariate(rate)
+            if t >= segment_end:
+                t = segment_end
+                break
+
+            if spike and spike.zone_id and rng.random() * spike.multiplier >= 1.0:
+                zone_id = spike.zone_id  # surplus arrivals go to the spiking zone
+            else:
+                zone_id = rng.choices(zone_ids, cum_weights=cum_zone_weights)[0]
+
+            required = (
+                rng.choices(features, cum_weights=cum_feature_weights)[0]
+                if features else SlotFeature.NONE
+            )
+            vehicle_seq += 1
+            yield Arrival(
+                time=t,
+                vehicle_id=f"SIM{vehicle_seq}",
+                zone_id=zone_id,
+                duration=rng.expovariate(1.0 / mean_dwell),
+                required_features=required,
+            )
+
+
+# ---------- Recorded Traces ----------
+TRACE_FIELDS = ["time", "vehicle_id", "zone_id", "duration", "required_features"]
+
+
+def read_trace(path: str) -> Iterator[Arrival]:
+    """Stream arrivals from a CSV trace sorted by ``time``."""
+    with open(path, newline="") as f:
+        last_time = -math.inf
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                arrival = Arrival(
+                    time=float(row["time"]),
+                    vehicle_id=row["vehicle_id"],
+                    zone_id=row["zone_id"],
+                    duration=float(row["duration"]),
+                    required_features=SlotFeature.from_names(
+                        name for name in (row.get("required_features") or "").split("|") if name
+                    ),
+                )
+            except (KeyError, ValueError) as e:
+                raise TraceError(f"{path}:{line_no}: {e}") from e
+            if arrival.time < last_time:
+                raise TraceError(f"{path}:{line_no}: trace is not sorted by time")
+            last_time = arrival.time
+            yield arrival
+
+
+def write_trace(path: str, arrivals: Iterable[Arrival]) -> int:
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TRACE_FIELDS)
+        for a in arrivals:
+            writer.writerow([
+                f"{a.time:.3f}", a.vehicle_id, a.zone_id, f"{a.duration:.3f}",
+                "|".join(a.required_features.to_names()),
+            ])
+            count += 1
+    return count